@@ -0,0 +1,71 @@
+# Arranque en frío: cuánto tarda un proceso nuevo en estar listo para atender
+# (lo que paga cada instancia serverless / autoescalada al levantar).
+# Cada corrida es un intérprete nuevo que mide import de main, lifespan y la primera petición.
+#   python -m bench.coldstart --runs 10
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from bench.common import ROOT, latency_summary, metadata, write_results
+
+PROBE = r"""
+import asyncio, json, time
+import httpx
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def probe():
+    async with main.app.router.lifespan_context(main.app):
+        t2 = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/")
+        t3 = time.perf_counter()
+    return t2, t3
+
+t2, t3 = asyncio.run(probe())
+print(json.dumps({
+    "import": t1 - t0,
+    "lifespan": t2 - t1,
+    "first_request": t3 - t2,
+    "ready": t3 - t0,
+    "cold_start": main.app.state.cold_start,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de main.app")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="ruta del JSON (default bench/results/coldstart-<commit>-<fecha>.json)")
+    args = parser.parse_args()
+
+    samples = {"process": [], "import": [], "lifespan": [], "first_request": [], "ready": []}
+    last = None
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        samples["process"].append(time.perf_counter() - t0)
+        last = json.loads(out.stdout.strip().splitlines()[-1])
+        for phase in ("import", "lifespan", "first_request", "ready"):
+            samples[phase].append(last[phase])
+
+    results = [{"bench": f"coldstart_{phase}", "latency_ms": latency_summary(values)}
+               for phase, values in samples.items()]
+    for row in results:
+        print(f"{row['bench']:<28} p50={row['latency_ms']['p50']:.2f}ms max={row['latency_ms']['max']:.2f}ms")
+    print("desglose de la última corrida:", last["cold_start"])
+
+    meta = metadata("coldstart", runs=args.runs, breakdown=last["cold_start"])
+    path = write_results("coldstart", meta, results, args.output)
+    print(f"resultados -> {path}")
+
+
+if __name__ == "__main__":
+    main()
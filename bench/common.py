@@ -0,0 +1,72 @@
+# Utilidades compartidas por los benchmarks (metadatos + escritura de resultados en JSON)
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "bench" / "results"
+
+DEFAULT_SIZES = [10**3, 10**5, 10**6]
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def metadata(kind: str, **extra) -> dict:
+    return {
+        "kind": kind,
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    # Percentil por "nearest rank" sobre una lista ya ordenada
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    # latencias en segundos -> resumen en milisegundos
+    values = sorted(latencies)
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": round(sum(values) / len(values) * 1000, 4),
+        "p50": round(percentile(values, 50) * 1000, 4),
+        "p95": round(percentile(values, 95) * 1000, 4),
+        "p99": round(percentile(values, 99) * 1000, 4),
+        "max": round(values[-1] * 1000, 4),
+    }
+
+
+def parse_sizes(raw: str) -> list[int]:
+    # "1e3,1e5" o "1000,100000"
+    return [int(float(s)) for s in raw.split(",") if s.strip()]
+
+
+def write_results(kind: str, meta: dict, results: list[dict], output: str | None) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = RESULTS_DIR / f"{kind}-{meta['commit']}-{stamp}.json"
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2, ensure_ascii=False))
+    return path
@@ -0,0 +1,57 @@
+# Compara dos corridas de bench.load o bench.micro (por ejemplo, main vs. una rama)
+#   python -m bench.compare bench/results/load-abc123-....json bench/results/load-def456-....json
+# Sale con código 1 si algún caso empeora más que --threshold (útil en CI).
+import argparse
+import json
+import sys
+
+
+def key(row: dict) -> tuple:
+    if "endpoint" in row:
+        return (row["endpoint"], row.get("size"))
+    return (row["bench"], row.get("size", row.get("words", row.get("items"))))
+
+
+def load(path: str) -> tuple[dict, dict]:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    rows = {key(r): r for r in data["results"] if "latency_ms" in r}
+    return data["meta"], rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dos resultados de benchmark")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", default="p50", choices=["mean", "p50", "p95", "p99", "max"])
+    parser.add_argument("--threshold", type=float, default=0.10, help="regresión tolerada (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    head_meta, head = load(args.head)
+    if base_meta["kind"] != head_meta["kind"]:
+        sys.exit(f"no se pueden comparar '{base_meta['kind']}' con '{head_meta['kind']}'")
+
+    print(f"{base_meta['commit']} -> {head_meta['commit']} ({args.metric})")
+    regressions = 0
+    for k in sorted(base.keys() & head.keys(), key=str):
+        before = base[k]["latency_ms"][args.metric]
+        after = head[k]["latency_ms"][args.metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESIÓN"
+            regressions += 1
+        name = f"{k[0]} [{k[1]}]" if k[1] is not None else k[0]
+        print(f"{name:<60} {before:>10.4f}ms -> {after:>10.4f}ms {change:>+8.1%}{flag}")
+
+    for k in sorted(base.keys() - head.keys(), key=str):
+        print(f"{k} solo en base")
+    for k in sorted(head.keys() - base.keys(), key=str):
+        print(f"{k} solo en head")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
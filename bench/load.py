@@ -0,0 +1,192 @@
+# Benchmark de carga: throughput y latencia de cada endpoint de router/ejercicio1..6
+#
+# En proceso (por defecto): siembra los stores y maneja main.app con httpx.ASGITransport
+#   python -m bench.load --sizes 1e3,1e5,1e6
+# Contra un uvicorn externo (sembrado con el mismo SEED, ver bench/server.py):
+#   ADMISSION_ENABLED=0 BENCH_SIZE=100000 uvicorn bench.server:app --port 8001
+#   python -m bench.load --target http://127.0.0.1:8001 --sizes 1e5
+#
+# El resultado se guarda como JSON en bench/results/ para comparar commits con bench.compare
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+
+import httpx
+
+from bench import seed
+from bench.common import DEFAULT_SIZES, latency_summary, metadata, parse_sizes, write_results
+
+TEXT = " ".join(seed.WORDS * 40)
+
+
+def build_endpoints(ids: dict) -> list[dict]:
+    # "route" es la ruta tal como la declara el router; "url" ya tiene los path params
+    return [
+        # Ejercicio 1
+        {"route": "/tasks", "method": "POST", "url": "/tasks",
+         "json": {"title": "bench", "description": "tarea de benchmark", "priority": 3}},
+        {"route": "/tasks/search", "method": "GET", "url": "/tasks/search",
+         "params": {"q": "Índices usuarios", "limit": 10}},
+        {"route": "/tasks/{task_id}", "method": "GET", "url": f"/tasks/{ids['task_id']}"},
+        {"route": "/tasks_all", "method": "GET", "url": "/tasks_all"},
+        {"route": "/tasks", "method": "GET", "url": "/tasks",
+         "params": {"complete": "false", "min_priority": 3, "skip": 0, "limit": 10}},
+        {"route": "/tasks/{task_id}/complete", "method": "PATCH", "url": f"/tasks/{ids['task_id']}/complete"},
+        {"route": "/tasks/next", "method": "POST", "url": "/tasks/next",
+         "json": {"worker": "bench", "lease_seconds": 30}},
+        # Ejercicio 2
+        {"route": "/convert", "method": "POST", "url": "/convert",
+         "json": {"category": "temperature", "from_unit": "C", "to_unit": "F", "value": 36.6}},
+        {"route": "/history_conversion_all", "method": "GET", "url": "/history_conversion_all"},
+        {"route": "/history/{category}", "method": "GET", "url": "/history/distance"},
+        {"route": "/history", "method": "GET", "url": "/history",
+         "params": {"category": "weight", "min_value": 500}},
+        # Ejercicio 3
+        {"route": "/register/validate", "method": "POST", "url": "/register/validate",
+         "json": {"username": "bench", "email": "bench@ejemplo.com", "password": "Clave1234", "age": 20}},
+        {"route": "/users/{username}/availability", "method": "GET", "url": f"/users/{ids['username']}/availability"},
+        {"route": "/password/rules", "method": "GET", "url": "/password/rules", "params": {"lang": "es"}},
+        # Ejercicio 4
+        {"route": "/movies", "method": "POST", "url": "/movies",
+         "json": {"title": "bench", "genres": "drama", "year": 2020, "rating": 7.5}},
+        {"route": "/movies/{movie_id}", "method": "GET", "url": f"/movies/{ids['movie_id']}"},
+        {"route": "/movies/{movie_id}/similar", "method": "GET", "url": f"/movies/{ids['movie_id']}/similar",
+         "params": {"limit": 10}},
+        {"route": "/movies", "method": "GET", "url": "/movies",
+         "params": {"genre": "drama", "min_rating": 8}},
+        {"route": "/movies/recommend", "method": "POST", "url": "/movies/recommend",
+         "json": {"preferred_genres": ["drama", "terror"], "min_year": 2000, "max_results": 10}},
+        # Ejercicio 5
+        {"route": "/products", "method": "POST", "url": "/products",
+         "json": {"name": "bench", "price": 10.5, "stock": 100}},
+        {"route": "/products", "method": "GET", "url": "/products",
+         "params": {"max_price": 100, "in_stock": "true"}},
+        {"route": "/cart/{cart_id}/items", "method": "POST", "url": "/cart/bench-write/items",
+         "json": {"product_id": ids["product_id"], "quantity": 1}},
+        {"route": "/cart/{cart_id}", "method": "GET", "url": f"/cart/{ids['cart_id']}"},
+        {"route": "/cart/{cart_id}/items/{product_id}", "method": "DELETE",
+         "url": f"/cart/bench-delete/items/{ids['product_id']}",
+         # antes de cada DELETE se agrega el item (no se mide)
+         "setup": {"method": "POST", "url": "/cart/bench-delete/items",
+                   "json": {"product_id": ids["product_id"], "quantity": 1}}},
+        # Ejercicio 6
+        {"route": "/text/analyze", "method": "POST", "url": "/text/analyze",
+         "params": {"ignore_stopwords": "true"}, "json": {"text": TEXT, "language": "es"}},
+        {"route": "/text/{word}/frequency", "method": "GET", "url": "/text/tabla/frequency",
+         "params": {"text": TEXT[:2000]}},
+        {"route": "/text/censor", "method": "POST", "url": "/text/censor",
+         "json": {"text": TEXT, "banned": ["sql", "css"], "mask": "*"}},
+        {"route": "/text/documents", "method": "POST", "url": "/text/documents",
+         "json": {"text": TEXT[:2000], "language": "es", "corpus": "bench"}},
+        {"route": "/text/search", "method": "GET", "url": "/text/search",
+         "params": {"q": "usuarios tabla", "corpus": "bench"}},
+        {"route": "/text/corpus/{corpus}", "method": "GET", "url": "/text/corpus/bench"},
+    ]
+
+
+def mounted_routes(app) -> set[tuple[str, str]]:
+    routes = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            routes.add((method, route.path))
+    return routes
+
+
+async def measure(client: httpx.AsyncClient, ep: dict, requests: int, concurrency: int, budget: float) -> dict:
+    latencies: list[float] = []
+    status: Counter = Counter()
+    remaining = requests
+    deadline = time.perf_counter() + budget
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0 and time.perf_counter() < deadline:
+            remaining -= 1
+            setup = ep.get("setup")
+            if setup:
+                await client.request(setup["method"], setup["url"], json=setup.get("json"))
+            t0 = time.perf_counter()
+            resp = await client.request(ep["method"], ep["url"], params=ep.get("params"), json=ep.get("json"))
+            await resp.aread()
+            latencies.append(time.perf_counter() - t0)
+            status[resp.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    done = len(latencies)
+    return {
+        "endpoint": f"{ep['method']} {ep['route']}",
+        "requests": done,
+        "errors": sum(c for code, c in status.items() if code >= 400),
+        "status": {str(code): c for code, c in sorted(status.items())},
+        "throughput_rps": round(done / wall, 2) if wall > 0 else 0.0,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run_size(size: int, args) -> list[dict]:
+    ids = seed.seed_all(size) if not args.target else seed.sample_ids(size)
+
+    if args.target:
+        client = httpx.AsyncClient(base_url=args.target, timeout=None)
+        mounted = None
+    else:
+        # Un solo cliente haciendo miles de peticiones: sin esto el rate limit cortaría el benchmark
+        os.environ.setdefault("ADMISSION_ENABLED", "0")
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+        mounted = mounted_routes(app)
+
+    results = []
+    async with client:
+        for ep in build_endpoints(ids):
+            name = f"{ep['method']} {ep['route']}"
+            if args.only and not any(token in name for token in args.only):
+                continue
+            if mounted is not None and (ep["method"], ep["route"]) not in mounted:
+                results.append({"size": size, "endpoint": name, "skipped": "route not mounted"})
+                print(f"[{size:>8}] {name:<45} skipped (route not mounted)")
+                continue
+            for _ in range(args.warmup):
+                await client.request(ep["method"], ep["url"], params=ep.get("params"), json=ep.get("json"))
+            row = await measure(client, ep, args.requests, args.concurrency, args.budget)
+            row["size"] = size
+            results.append(row)
+            lat = row["latency_ms"]
+            print(f"[{size:>8}] {name:<45} {row['throughput_rps']:>10.1f} req/s  "
+                  f"p50={lat['p50']:.3f}ms p99={lat['p99']:.3f}ms errors={row['errors']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga de los routers")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="registros por store, separados por coma (default 1e3,1e5,1e6)")
+    parser.add_argument("--requests", type=int, default=200, help="peticiones por endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="clientes concurrentes")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="segundos máximos por endpoint (los listados grandes cortan antes)")
+    parser.add_argument("--warmup", type=int, default=2, help="peticiones de calentamiento sin medir")
+    parser.add_argument("--only", nargs="*", help="filtra endpoints por substring (ej. /tasks /cart)")
+    parser.add_argument("--target", help="URL de un uvicorn externo en lugar de main.app en proceso")
+    parser.add_argument("--output", help="ruta del JSON (default bench/results/load-<commit>-<fecha>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.extend(asyncio.run(run_size(size, args)))
+
+    meta = metadata(
+        "load", target=args.target or "in-process", sizes=args.sizes, requests=args.requests,
+        concurrency=args.concurrency, budget=args.budget
+    )
+    path = write_results("load", meta, results, args.output)
+    print(f"resultados -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Memoria por registro en los stores en memoria
+# Compara, con tracemalloc, lo que ocupa cada registro:
+# - antes: modelo de Pydantic + id como str (uuid de 36 caracteres) de clave
+# - ahora: registro compacto (__slots__ / NamedTuple) + id como int de 128 bits
+# Los strings de contenido se crean fuera de la medición (son iguales en ambos casos),
+# así solo se mide el contenedor + la clave + la entrada del dict.
+#   python -m bench.memory --sizes 1e3,1e5
+import argparse
+import gc
+import random
+import tracemalloc
+
+from bench import seed
+from bench.common import metadata, parse_sizes, write_results
+from core.records import format_id
+from router import ejercicio1, ejercicio3, ejercicio4, ejercicio5
+
+
+def task_fields(rng: random.Random, i: int) -> dict:
+    return dict(title=seed.sentence(rng, 3), description=seed.sentence(rng, 12),
+                priority=rng.randint(1, 5), complete=rng.random() < 0.5)
+
+
+def movie_fields(rng: random.Random, i: int) -> dict:
+    return dict(title=seed.sentence(rng, 2), genres=rng.choice(seed.GENRES),
+                year=rng.randint(1950, 2026), rating=round(rng.uniform(0, 10), 1))
+
+
+def product_fields(rng: random.Random, i: int) -> dict:
+    return dict(name=seed.sentence(rng, 2), price=round(rng.uniform(1, 500), 2),
+                stock=rng.randint(0, 1_000_000))
+
+
+def user_fields(rng: random.Random, i: int) -> dict:
+    return dict(username=f"user{i}", email=f"user{i}@ejemplo.com",
+                password=f"Clave{rng.randint(1000, 9999)}", age=rng.randint(13, 80))
+
+
+# store -> (namespace del id, campos, modelo "antes", registro "ahora")
+# Los usuarios se guardan en una lista, sin id.
+STORES = {
+    "tasks": (1, task_fields, ejercicio1.Task, ejercicio1.TaskRecord),
+    "movies": (4, movie_fields, ejercicio4.Pelicula, ejercicio4.PeliculaRecord),
+    "products": (5, product_fields, ejercicio5.Product, ejercicio5.ProductRecord),
+    "users": (None, user_fields, ejercicio3.UsuarioType, ejercicio3.UsuarioRecord),
+}
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    store = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return size
+
+
+def bench_store(name: str, n: int) -> dict:
+    namespace, make_fields, model, record = STORES[name]
+    rows = [make_fields(random.Random(seed.SEED + i), i) for i in range(n)]
+
+    if namespace is None:
+        before = measure(lambda: [model(**row) for row in rows])
+        after = measure(lambda: [record(**row) for row in rows])
+    else:
+        # La clave se crea dentro de la medición: es parte de lo que se guarda
+        before = measure(lambda: {
+            (sid := format_id(seed.make_key(namespace, i))): model(id=sid, **row) for i, row in enumerate(rows)
+        })
+        after = measure(lambda: {
+            (key := seed.make_key(namespace, i)): record(id=key, **row) for i, row in enumerate(rows)
+        })
+
+    return {
+        "bench": f"memory_{name}",
+        "size": n,
+        "before_bytes_per_record": round(before / n, 1),
+        "after_bytes_per_record": round(after / n, 1),
+        "saved_pct": round(100 * (1 - after / before), 1) if before else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por registro: modelos de Pydantic vs registros compactos")
+    parser.add_argument("--sizes", default="1e3,1e5", help="ej. 1e3,1e5")
+    parser.add_argument("--output", help="ruta del JSON (default bench/results/memory-<commit>-<fecha>.json)")
+    args = parser.parse_args()
+    sizes = parse_sizes(args.sizes)
+
+    results = []
+    for n in sizes:
+        for name in STORES:
+            row = bench_store(name, n)
+            results.append(row)
+            print(f"{row['bench']:<18} n={n:<8} antes={row['before_bytes_per_record']:>7}B "
+                  f"ahora={row['after_bytes_per_record']:>7}B (-{row['saved_pct']}%)")
+
+    meta = metadata("memory", sizes=sizes)
+    path = write_results("memory", meta, results, args.output)
+    print(f"resultados -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Micro-benchmarks de las funciones calientes (sin HTTP de por medio)
+# - tokenize (ejercicio6)
+# - build_cart (ejercicio5)
+# - los bucles de filtrado de GET /tasks, /history, /movies, /products y /movies/recommend
+#
+#   python -m bench.micro --sizes 1e3,1e5
+import argparse
+import asyncio
+import random
+import timeit
+
+from fastapi import Response
+
+from bench import seed
+from bench.common import DEFAULT_SIZES, latency_summary, metadata, parse_sizes, write_results
+from router import ejercicio1, ejercicio2, ejercicio4, ejercicio5, ejercicio6
+
+TEXT_WORDS = [10**2, 10**4, 10**5]
+CART_SIZES = [10, 100, 1000]
+
+
+def time_it(fn, repeat: int) -> dict:
+    # autorange elige cuántas veces correr fn para que cada muestra dure >= 0.2s
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"number": number, "repeat": repeat, "latency_ms": latency_summary(samples)}
+
+
+def run_coro(loop, coro_fn, **kwargs):
+    return lambda: loop.run_until_complete(coro_fn(**kwargs))
+
+
+def bench_tokenize(repeat: int) -> list[dict]:
+    rng = random.Random(seed.SEED)
+    rows = []
+    for n in TEXT_WORDS:
+        text = seed.sentence(rng, n)
+        rows.append({"bench": "tokenize", "words": n, **time_it(lambda: ejercicio6.tokenize(text), repeat)})
+    return rows
+
+
+def bench_build_cart(repeat: int) -> list[dict]:
+    rows = []
+    seed.seed_products(max(CART_SIZES), random.Random(seed.SEED))
+    ids = list(ejercicio5.product_history)
+    for n in CART_SIZES:
+        cart_id = f"micro-{n}"
+        ejercicio5.cart_history[cart_id] = {pid: 1 for pid in ids[:n]}
+        rows.append({"bench": "build_cart", "items": n, **time_it(lambda: ejercicio5.build_cart(cart_id), repeat)})
+    return rows
+
+
+def bench_filters(size: int, repeat: int) -> list[dict]:
+    seed.seed_all(size)
+    loop = asyncio.new_event_loop()
+    # Se llama a los handlers directamente, así que hay que pasar todos los parámetros
+    # (los defaults son objetos Query/Header de FastAPI, no valores)
+    cases = {
+        "filter_tasks": run_coro(loop, ejercicio1.getListTaskFiltrado,
+                                 complete=False, min_priority=3, skip=0, limit=10, fields=None),
+        "filter_history": run_coro(loop, ejercicio2.getFiltroHistory, category="weight", min_value=500, fields=None),
+        "filter_history_category": run_coro(loop, ejercicio2.filtrarHistorialCategory, category="distance", fields=None),
+        "filter_movies": run_coro(loop, ejercicio4.filtraMovies, response=Response(),
+                                  genre="drama", min_rating=8, year=None, fields=None, if_none_match=None),
+        "recommend_movies": run_coro(loop, ejercicio4.recommend_movies, req=ejercicio4.Solicitud(
+            preferred_genres=["drama", "terror"], min_year=2000, max_results=10)),
+        "filter_products": run_coro(loop, ejercicio5.list_products, response=Response(),
+                                    max_price=100, in_stock=True, fields=None, if_none_match=None),
+    }
+    rows = []
+    try:
+        for name, fn in cases.items():
+            rows.append({"bench": name, "size": size, **time_it(fn, repeat)})
+    finally:
+        loop.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de helpers y filtros")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="registros por store para los filtros (default 1e3,1e5,1e6)")
+    parser.add_argument("--repeat", type=int, default=5, help="muestras por caso")
+    parser.add_argument("--output", help="ruta del JSON (default bench/results/micro-<commit>-<fecha>.json)")
+    args = parser.parse_args()
+
+    results = bench_tokenize(args.repeat) + bench_build_cart(args.repeat)
+    for size in args.sizes:
+        results.extend(bench_filters(size, args.repeat))
+
+    for row in results:
+        label = row["bench"] + "".join(f" {k}={row[k]}" for k in ("words", "items", "size") if k in row)
+        print(f"{label:<45} mean={row['latency_ms']['mean']:.4f}ms")
+
+    path = write_results("micro", metadata("micro", sizes=args.sizes, repeat=args.repeat), results, args.output)
+    print(f"resultados -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Sembrado de datos para los benchmarks
+# Llena los "stores" en memoria de cada router con N registros deterministas
+# (mismos ids en cada corrida) para que los resultados se puedan comparar entre commits.
+import random
+from core import versioning
+from core.records import format_id
+from router import ejercicio1, ejercicio2, ejercicio3, ejercicio4, ejercicio5
+
+SEED = 20260219
+
+GENRES = ["accion", "drama", "comedia", "terror", "ciencia ficcion", "animacion", "documental"]
+CATEGORIES = {
+    "temperature": [("C", "F", "valor * (9/5) + 32"), ("F", "C", "(valor - 32) * (5/9)")],
+    "distance": [("KM", "M", "valor * 1000"), ("M", "KM", "valor / 1000")],
+    "weight": [("KG", "G", "valor * 1000"), ("G", "KG", "valor / 1000")],
+}
+WORDS = (
+    "optimizar consultas sql agregar indices tabla usuarios mejorar tiempo respuesta "
+    "corregir estilos css ajustar padding contenedor principal dispositivos moviles "
+    "reunion tecnica definir arquitectura microservicios nuevo modulo actualizar readme "
+    "pruebas integracion ejecutar suite tests entorno staging"
+).split()
+
+CART_ID = "bench-cart"
+CART_ITEMS = 50
+
+
+def make_key(namespace: int, i: int) -> int:
+    # uuid "falso" pero estable (como int, igual que las claves de los stores):
+    # el namespace evita choques entre stores
+    return (namespace << 96) | i
+
+
+def make_id(namespace: int, i: int) -> str:
+    # El mismo id como str, para los path params
+    return format_id(make_key(namespace, i))
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed_tasks(n: int, rng: random.Random):
+    store = {}
+    for i in range(n):
+        task_id = make_key(1, i)
+        store[task_id] = ejercicio1.TaskRecord(
+            id=task_id,
+            title=sentence(rng, 3),
+            description=sentence(rng, 12),
+            priority=rng.randint(1, 5),
+            complete=rng.random() < 0.5,
+        )
+    ejercicio1.tasks_repertory.clear()
+    ejercicio1.tasks_repertory.update(store)
+    ejercicio1.reindex_tasks()
+    versioning.bump("tasks")
+
+
+def seed_conversions(n: int, rng: random.Random):
+    history = []
+    categories = list(CATEGORIES)
+    for i in range(n):
+        category = rng.choice(categories)
+        from_unit, to_unit, formula = rng.choice(CATEGORIES[category])
+        value = round(rng.uniform(0, 1000), 2)
+        history.append(ejercicio2.Conversion(
+            id=make_id(2, i),
+            category=category,
+            from_unit=from_unit,
+            to_unit=to_unit,
+            value=value,
+            result=value,
+            formula=formula,
+            timestamp="2026-01-01T00:00:00",
+        ))
+    ejercicio2.history_conversion.clear()
+    ejercicio2.history_conversion.extend(history)
+    versioning.bump("conversions")
+
+
+def seed_users(n: int, rng: random.Random):
+    users = [
+        ejercicio3.UsuarioRecord(
+            username=f"user{i}",
+            email=f"user{i}@ejemplo.com",
+            password=f"Clave{rng.randint(1000, 9999)}",
+            age=rng.randint(13, 80),
+        )
+        for i in range(n)
+    ]
+    ejercicio3.history_users.clear()
+    ejercicio3.history_users.extend(users)
+    versioning.bump("users")
+
+
+def seed_movies(n: int, rng: random.Random):
+    store = {}
+    for i in range(n):
+        movie_id = make_key(4, i)
+        store[movie_id] = ejercicio4.PeliculaRecord(
+            id=movie_id,
+            title=sentence(rng, 2),
+            genres=rng.choice(GENRES),
+            year=rng.randint(1950, 2026),
+            rating=round(rng.uniform(0, 10), 1),
+        )
+    ejercicio4.movies_history.clear()
+    ejercicio4.movies_history.update(store)
+    ejercicio4.reindex_movies()
+    versioning.bump("movies")
+
+
+def seed_products(n: int, rng: random.Random):
+    store = {}
+    for i in range(n):
+        product_id = make_key(5, i)
+        store[product_id] = ejercicio5.ProductRecord(
+            id=product_id,
+            name=sentence(rng, 2),
+            price=round(rng.uniform(1, 500), 2),
+            stock=rng.randint(0, 1_000_000),
+        )
+    ejercicio5.product_history.clear()
+    ejercicio5.product_history.update(store)
+
+    # Un carrito con varios items para medir build_cart / GET /cart/{cart_id}
+    ids = list(store)
+    cart = {pid: rng.randint(1, 3) for pid in rng.sample(ids, min(CART_ITEMS, len(ids)))}
+    ejercicio5.cart_history.clear()
+    ejercicio5.cart_history[CART_ID] = cart
+    # producto con stock de sobra para POST/DELETE de items
+    store[ids[0]].stock = 10**9
+    versioning.bump("products")
+    versioning.bump("carts")
+
+
+def sample_ids(n: int) -> dict:
+    # Ids de muestra que usan los benchmarks en los path params. Como el sembrado es
+    # determinista sirven también contra un servidor externo sembrado con el mismo n.
+    return {
+        "size": n,
+        "task_id": make_id(1, n // 2),
+        "username": f"user{n // 2}",
+        "movie_id": make_id(4, n // 2),
+        "product_id": make_id(5, 0),
+        "cart_id": CART_ID,
+    }
+
+
+def seed_all(n: int) -> dict:
+    rng = random.Random(SEED)
+    seed_tasks(n, rng)
+    seed_conversions(n, rng)
+    seed_users(n, rng)
+    seed_movies(n, rng)
+    seed_products(n, rng)
+    return sample_ids(n)
@@ -0,0 +1,11 @@
+# App para correr el benchmark contra un uvicorn externo:
+#   ADMISSION_ENABLED=0 BENCH_SIZE=100000 uvicorn bench.server:app --port 8001
+# Siembra los stores al importar (mismo SEED que bench.load, así coinciden los ids).
+import os
+
+from bench import seed
+from main import app
+
+seed.seed_all(int(float(os.environ.get("BENCH_SIZE", "1000"))))
+
+__all__ = ["app"]
@@ -0,0 +1 @@
+# Vacío a propósito: deja la raíz del repo en sys.path para que los tests importen core/ y router/
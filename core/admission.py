@@ -0,0 +1,218 @@
+# Control de admisión: protege el event loop de clientes que mandan trabajo caro
+# 1. Tamaño del body: Content-Length por encima de max_body_bytes -> 413 (no numérico -> 400)
+# 2. Query param `limit` por encima de max_limit -> 400 (leído como lo lee FastAPI: nombre
+#    decodificado y valor convertido con las reglas de Pydantic, "+5000", "5_000", "5000.0"...)
+# 3. Token bucket por cliente: cada ruta cuesta N tokens (las de CPU cuestan más) -> 429
+# 4. Límite de peticiones en curso: si se llena, 503 inmediato en vez de encolar
+#    (los bodies chunked, sin Content-Length, se leen con tope de max_body_bytes -> 413)
+# Los rechazos llevan Retry-After y salen antes de tocar el router, así que cuestan casi nada.
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+from pydantic import TypeAdapter, ValidationError
+from starlette.datastructures import Headers
+
+# (método, regex del path, costo en tokens); la primera que coincide gana, si no cuesta 1
+DEFAULT_ROUTE_COSTS = [
+    ("POST", r"^/text/analyze$", 10),
+    ("POST", r"^/text/censor$", 10),
+    ("GET", r"^/text/[^/]+/frequency$", 5),
+    ("POST", r"^/text/documents$", 5),
+    ("GET", r"^/text/search$", 2),
+    ("POST", r"^/movies/recommend$", 5),
+    ("GET", r"^/tasks_all$", 20),
+    ("GET", r"^/history_conversion_all$", 20),
+    ("GET", r"^/tasks/search$", 2),
+]
+
+LIMIT_ADAPTER = TypeAdapter(int)  # la misma conversión que hace FastAPI con `limit: int`
+
+stats = {
+    "admitted": 0,
+    "rejected_body": 0,
+    "rejected_limit": 0,
+    "rejected_rate": 0,
+    "rejected_overload": 0,
+    "in_flight": 0,
+}
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+
+def replay(body: bytes, receive):
+    sent = False
+
+    async def replayed():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()  # después del body solo queda esperar el http.disconnect
+
+    return replayed
+
+
+class AdmissionMiddleware:
+    def __init__(
+        self,
+        app,
+        rate: float = 50.0,  # tokens por segundo que recupera cada cliente
+        burst: float = 100.0,  # capacidad del bucket
+        route_costs=None,
+        max_concurrency: int = 256,
+        max_body_bytes: int = 1024 * 1024,
+        max_limit: int = 1000,
+        max_clients: int = 100_000,
+        exempt_paths=("/events",),  # streams largos: no ocupan cupo de concurrencia
+        trusted_proxies: int = 0,  # proxies propios delante de la app (0 = ignorar X-Forwarded-For)
+    ):
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.route_costs = [
+            (method, re.compile(pattern), min(cost, burst))
+            for method, pattern, cost in (route_costs if route_costs is not None else DEFAULT_ROUTE_COSTS)
+        ]
+        self.max_concurrency = max_concurrency
+        self.max_body_bytes = max_body_bytes
+        self.max_limit = max_limit
+        self.max_clients = max_clients
+        self.exempt_paths = tuple(exempt_paths)
+        self.trusted_proxies = trusted_proxies
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def client_id(self, scope, headers: Headers) -> str:
+        # Cada proxy agrega a la derecha la IP de quien le habló; lo de la izquierda lo pudo
+        # escribir el cliente. Con N proxies propios, el cliente real es el N-ésimo desde la derecha.
+        if self.trusted_proxies:
+            forwarded = [ip.strip() for ip in ",".join(headers.getlist("x-forwarded-for")).split(",")]
+            if len(forwarded) >= self.trusted_proxies and forwarded[-self.trusted_proxies]:
+                return forwarded[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "anonymous"
+
+    def cost(self, method: str, path: str) -> float:
+        for rule_method, pattern, cost in self.route_costs:
+            if rule_method == method and pattern.match(path):
+                return cost
+        return 1
+
+    def take(self, client: str, cost: float) -> float:
+        # Devuelve 0 si se admitió, o los segundos que faltan para tener `cost` tokens
+        now = time.monotonic()
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(self.burst, now)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)  # el cliente inactivo hace más tiempo
+        else:
+            self.buckets.move_to_end(client)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return 0.0
+        return (cost - bucket.tokens) / self.rate
+
+    async def read_body(self, receive):
+        # None si se pasa del máximo (o el cliente se desconecta a mitad)
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def reject(self, send, status: int, detail: str, retry_after: float = None, reason: str = ""):
+        stats[f"rejected_{reason}"] += 1
+        body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(max(1, math.ceil(retry_after))).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        method = scope["method"]
+        path = scope["path"]
+
+        # 1. Body (por cabecera; no cuesta leer nada)
+        content_length = headers.get("content-length")
+        if content_length is not None and not content_length.isdigit():
+            await self.reject(send, 400, "Content-Length inválido", reason="body")
+            return
+        if content_length is not None and int(content_length) > self.max_body_bytes:
+            await self.reject(send, 413, f"Body demasiado grande (máximo {self.max_body_bytes} bytes)",
+                              reason="body")
+            return
+
+        # 2. limit (se parsea igual que Starlette: lim%69t también es limit)
+        query = scope.get("query_string", b"").decode("latin-1")
+        if query:
+            for key, value in parse_qsl(query, keep_blank_values=True):
+                if key != "limit":
+                    continue
+                try:
+                    limit = LIMIT_ADAPTER.validate_python(value)
+                except ValidationError:
+                    continue  # no es un entero: el handler responde 422
+                if limit > self.max_limit:
+                    await self.reject(send, 400, f"limit máximo: {self.max_limit}", reason="limit")
+                    return
+
+        # 3. Token bucket
+        wait = self.take(self.client_id(scope, headers), self.cost(method, path))
+        if wait > 0:
+            await self.reject(send, 429, "Demasiadas peticiones", retry_after=wait, reason="rate")
+            return
+
+        # 4. Concurrencia
+        if path.startswith(self.exempt_paths):
+            stats["admitted"] += 1
+            await self.app(scope, receive, send)
+            return
+        if stats["in_flight"] >= self.max_concurrency:
+            await self.reject(send, 503, "Servidor ocupado, reintenta", retry_after=1, reason="overload")
+            return
+
+        # Body sin Content-Length (chunked): se lee hasta el máximo y luego se re-entrega al app
+        if content_length is None and method in ("POST", "PUT", "PATCH"):
+            body = await self.read_body(receive)
+            if body is None:
+                await self.reject(send, 413, f"Body demasiado grande (máximo {self.max_body_bytes} bytes)",
+                                  reason="body")
+                return
+            receive = replay(body, receive)
+
+        stats["admitted"] += 1
+        stats["in_flight"] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats["in_flight"] -= 1
@@ -0,0 +1,163 @@
+# Chequeo offline de contraseñas filtradas (sin mandar nada a un servicio externo)
+# La lista se guarda como archivo binario: una cabecera de 16 bytes y luego los SHA-1
+# ordenados, todos del mismo ancho (20 bytes, o un prefijo más corto para achicar el archivo).
+# El archivo se abre con mmap y se busca por bisección: O(log N) lecturas por consulta
+# (~30 para cientos de millones) y el RSS solo crece con las páginas que se tocan.
+#
+# Construir el archivo a partir de una lista en texto plano (una contraseña por línea, o
+# líneas "SHA1HEX" / "SHA1HEX:conteo" como las de Have I Been Pwned):
+#   python -m core.breached lista.txt breached.bin --width 20
+# El orden se hace por bloques en disco (ordenamiento externo), así no hace falta tener
+# toda la lista en memoria.
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b"SHA1IDX1"
+HEADER = struct.Struct("<8sII")  # magic, ancho de cada hash, reservado
+MAX_WIDTH = 20  # un SHA-1 completo
+HEX_LINE = re.compile(rb"^([0-9a-fA-F]{40})(?::\d+)?$")
+
+
+class BreachedHashes:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path}: archivo demasiado corto")
+            magic, width, _ = HEADER.unpack(header)
+            if magic != MAGIC or not 1 <= width <= MAX_WIDTH:
+                raise ValueError(f"{path}: no es un índice de hashes filtrados")
+            size = os.fstat(f.fileno()).st_size
+            if (size - HEADER.size) % width:
+                raise ValueError(f"{path}: tamaño inválido para registros de {width} bytes")
+            self.width = width
+            self.count = (size - HEADER.size) // width
+            # mmap de 0 bytes no se puede: un índice vacío simplemente no encuentra nada
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def contains_digest(self, digest: bytes) -> bool:
+        key = digest[:self.width]
+        data, width = self.data, self.width
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * width
+            if data[offset:offset + width] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        offset = HEADER.size + lo * width
+        return lo < self.count and data[offset:offset + width] == key
+
+    def contains(self, password: str) -> bool:
+        return self.contains_digest(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def stats(self) -> dict:
+        return {"path": self.path, "hashes": self.count, "width": self.width}
+
+
+def open_from_env(var: str = "BREACHED_PASSWORDS_PATH") -> Optional[BreachedHashes]:
+    # None si la variable no está definida: el chequeo queda apagado
+    path = os.environ.get(var)
+    return BreachedHashes(path) if path else None
+
+
+# ---- construcción del archivo ----
+def line_digest(line: bytes) -> Optional[bytes]:
+    line = line.rstrip(b"\r\n")
+    if not line:
+        return None
+    match = HEX_LINE.match(line)
+    if match:
+        return bytes.fromhex(match.group(1).decode("ascii"))
+    return hashlib.sha1(line).digest()
+
+
+def write_run(digests: list[bytes], directory: str) -> str:
+    digests.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"".join(digests))
+    return path
+
+
+def read_run(path: str, width: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(width * 65536)
+            if not chunk:
+                return
+            for i in range(0, len(chunk), width):
+                yield chunk[i:i + width]
+
+
+def build(lines: Iterable[bytes], output: str, width: int = MAX_WIDTH, chunk_size: int = 5_000_000) -> int:
+    # Devuelve cuántos hashes distintos quedaron en el archivo
+    if not 1 <= width <= MAX_WIDTH:
+        raise ValueError(f"width debe estar entre 1 y {MAX_WIDTH}")
+    directory = os.path.dirname(os.path.abspath(output))
+    runs: list[str] = []
+    chunk: list[bytes] = []
+    try:
+        for line in lines:
+            digest = line_digest(line)
+            if digest is None:
+                continue
+            chunk.append(digest[:width])
+            if len(chunk) >= chunk_size:
+                runs.append(write_run(chunk, directory))
+                chunk = []
+        if chunk:
+            runs.append(write_run(chunk, directory))
+
+        count = 0
+        previous = None
+        tmp_output = output + ".tmp"
+        with open(tmp_output, "wb") as out:
+            out.write(HEADER.pack(MAGIC, width, 0))
+            for digest in heapq.merge(*(read_run(path, width) for path in runs)):
+                if digest != previous:  # sin duplicados
+                    out.write(digest)
+                    previous = digest
+                    count += 1
+        os.replace(tmp_output, output)  # el servidor nunca ve un archivo a medio escribir
+        return count
+    finally:
+        for path in runs:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye el índice binario de contraseñas filtradas")
+    parser.add_argument("input", help="lista en texto plano (contraseña, SHA1HEX o SHA1HEX:conteo por línea)")
+    parser.add_argument("output", help="archivo binario de salida")
+    parser.add_argument("--width", type=int, default=MAX_WIDTH,
+                        help="bytes del SHA-1 que se guardan (20 = completo; 8 ya da muy pocos falsos positivos)")
+    parser.add_argument("--chunk-size", type=int, default=5_000_000, help="hashes por bloque ordenado en memoria")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    with open(args.input, "rb") as f:
+        count = build(f, args.output, args.width, args.chunk_size)
+    print(f"{count} hashes -> {args.output} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Change feed: bus de eventos en memoria para avisar de cada cambio en los stores
+# Los routers llaman a publish() después de cada escritura; los clientes se suscriben por
+# SSE (GET /events) o WebSocket (/ws/events) con filtros por tópico y así no tienen que
+# hacer polling.
+#
+# Tópicos: "tasks", "conversions", "users", "movies", "products", "carts/<cart_id>".
+# Un filtro "carts" recibe todos los carritos; "carts/abc" solo ese.
+#
+# Cada suscriptor tiene una cola acotada. Si se llena (cliente lento) se le desconecta en
+# lugar de frenar a los demás o acumular memoria sin límite.
+import asyncio
+import itertools
+import json
+from typing import Any, Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+MAX_QUEUE = 256
+
+DROPPED = object()  # marca en la cola: el suscriptor fue expulsado por lento
+
+
+def root(topic: str) -> str:
+    return topic.split("/", 1)[0]
+
+
+class Subscriber:
+    def __init__(self, topics: Iterable[str], maxsize: int = MAX_QUEUE):
+        self.topics = frozenset(t.strip() for t in topics if t.strip())
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def wants(self, topic: str) -> bool:
+        return any(topic == t or topic.startswith(t + "/") for t in self.topics)
+
+    async def get(self) -> Optional[str]:
+        # Devuelve el evento ya serializado, o None si el bus lo desconectó por lento
+        message = await self.queue.get()
+        return None if message is DROPPED else message
+
+
+class ChangeFeed:
+    def __init__(self):
+        self.by_root: dict[str, set[Subscriber]] = {}
+        self.seq = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, topics: Iterable[str], maxsize: int = MAX_QUEUE) -> Subscriber:
+        sub = Subscriber(topics, maxsize)
+        for topic in sub.topics:
+            self.by_root.setdefault(root(topic), set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        for topic in sub.topics:
+            subs = self.by_root.get(root(topic))
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self.by_root[root(topic)]
+
+    def publish(self, topic: str, event: str, data: Any):
+        subs = self.by_root.get(root(topic))
+        self.published += 1
+        if not subs:
+            return
+        # Se serializa una sola vez y se comparte el mismo string con todos
+        message = json.dumps({
+            "id": next(self.seq),
+            "topic": topic,
+            "event": event,
+            "data": jsonable_encoder(data),
+        }, ensure_ascii=False)
+        for sub in list(subs):
+            if not sub.wants(topic):
+                continue
+            try:
+                sub.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self.drop(sub)
+
+    def drop(self, sub: Subscriber):
+        # Backpressure: se vacía su cola y se deja solo la marca para que cierre la conexión
+        self.unsubscribe(sub)
+        sub.dropped = True
+        self.dropped_subscribers += 1
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(DROPPED)
+
+    def stats(self) -> dict:
+        subscribers = set().union(*self.by_root.values()) if self.by_root else set()
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+feed = ChangeFeed()
+
+
+def publish(topic: str, event: str, data: Any):
+    feed.publish(topic, event, data)
@@ -0,0 +1,125 @@
+# Middleware de compresión negociada (br / gzip) para respuestas grandes
+# - Elige la codificación según Accept-Encoding (respeta q=0) y prefiere brotli si está instalado.
+# - Solo comprime a partir de minimum_size bytes y para tipos de contenido "de texto".
+# - No toca respuestas que ya vienen codificadas ni los streams de SSE.
+# - Con una codificación negociada, el ETag de las respuestas comprimibles pasa a ser débil
+#   aunque el cuerpo sea chico, y los 304 llevan el mismo Vary y el mismo ETag débil que
+#   tendría el 200 (el 304 no trae cuerpo para saber si se habría comprimido).
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:  # brotli es opcional: sin él solo se ofrece gzip
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    offered = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            offered[coding] = q
+
+    def accepts(coding: str) -> bool:
+        return offered.get(coding, offered.get("*", 0.0)) > 0
+
+    if brotli is not None and accepts("br"):
+        return "br"
+    if accepts("gzip"):
+        return "gzip"
+    return None
+
+
+def negotiated(headers: MutableHeaders):
+    # Otra representación del mismo recurso: Vary + el ETag pasa a ser débil
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if message["status"] == 304:
+                    # Mismos validadores que el 200 (RFC 9110, 15.4.5)
+                    negotiated(MutableHeaders(raw=message["headers"]))
+                    passthrough = True
+                    await send(message)
+                    return
+                if (
+                    message["status"] < 200
+                    or message["status"] == 204
+                    or "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or content_type.startswith("text/event-stream")
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            # http.response.body: se junta todo el cuerpo y se decide al final
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            negotiated(headers)
+            if len(body) >= self.minimum_size:
+                level = self.brotli_quality if encoding == "br" else self.gzip_level
+                body = compress(body, encoding, level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,134 @@
+# Índice invertido TF-IDF para un corpus de documentos (modo "corpus" del analizador de texto)
+# - Postings compactos: por término, un bytearray con pares (salto de doc, tf) en varint.
+#   Los ids de documento son crecientes, así que el salto suele caber en 1 byte.
+# - La decodificación se hace con NumPy de una sola vez (sin bucles por byte en Python).
+# - Se mantienen df por término y frecuencia total en el corpus, así el top de términos
+#   sale sin volver a leer los textos.
+# Ranking: peso del documento = (1 + log tf) normalizado por la norma del documento;
+# peso de la consulta = idf suavizado. score = suma sobre los términos de la consulta.
+import heapq
+import math
+from array import array
+from typing import Callable, Iterable, Optional
+
+
+def encode_varint(value: int, out: bytearray):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varints(buf: bytearray):
+    # bytes varint -> np.ndarray de enteros (vectorizado)
+    import numpy as np
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts = (7 * (np.arange(len(raw)) - starts[group])).astype(np.uint64)
+    parts = (raw & 0x7F).astype(np.uint64) << shifts
+    return np.add.reduceat(parts, starts)
+
+
+class TermPostings:
+    __slots__ = ("data", "last_doc", "df", "count")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.last_doc = -1
+        self.df = 0
+        self.count = 0
+
+    def append(self, doc: int, tf: int):
+        encode_varint(doc - self.last_doc - 1 if self.last_doc >= 0 else doc, self.data)
+        encode_varint(tf, self.data)
+        self.last_doc = doc
+        self.df += 1
+        self.count += tf
+
+    def decode(self):
+        # -> (docs, tfs) como arrays de NumPy
+        import numpy as np
+        values = decode_varints(self.data)
+        gaps = values[0::2].astype(np.int64)
+        gaps[1:] += 1  # se guardó (salto - 1) a partir del segundo documento
+        return np.cumsum(gaps), values[1::2].astype(np.float64)
+
+
+class CorpusIndex:
+    def __init__(self, tokenizer: Callable[[str], list[str]]):
+        self.tokenizer = tokenizer
+        self.documents: list[dict] = []
+        self.doc_norms = array("d")
+        self.postings: dict[str, TermPostings] = {}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, text: str, language: str, stopwords: Iterable[str], title: Optional[str] = None) -> dict:
+        stop = stopwords if isinstance(stopwords, (set, frozenset)) else set(stopwords)
+        counts: dict[str, int] = {}
+        for token in self.tokenizer(text):
+            token = token.lower()
+            if token in stop:
+                continue
+            counts[token] = counts.get(token, 0) + 1
+
+        doc = len(self.documents)
+        for term, tf in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = TermPostings()
+            postings.append(doc, tf)
+
+        norm = math.sqrt(sum((1 + math.log(tf)) ** 2 for tf in counts.values())) or 1.0
+        self.doc_norms.append(norm)
+        document = {"id": doc, "title": title, "language": language, "text": text, "terms": len(counts)}
+        self.documents.append(document)
+        return document
+
+    def idf(self, df: int) -> float:
+        return math.log((1 + len(self.documents)) / (1 + df)) + 1
+
+    def search(self, query: str, limit: int = 10) -> tuple[int, list[tuple[dict, float]]]:
+        import numpy as np
+        terms = {t.lower() for t in self.tokenizer(query)}
+        parts = []
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            docs, tfs = postings.decode()
+            parts.append((docs, self.idf(postings.df) * (1 + np.log(tfs))))
+        if not parts:
+            return 0, []
+
+        dense = np.bincount(
+            np.concatenate([d for d, _ in parts]),
+            weights=np.concatenate([w for _, w in parts]),
+            minlength=len(self.documents),
+        )
+        dense /= np.frombuffer(self.doc_norms, dtype=np.float64)
+        docs = np.flatnonzero(dense)
+        scores = dense[docs]
+        if len(docs) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            best = np.arange(len(docs))
+        best = best[np.lexsort((docs[best], -scores[best]))]
+        return len(docs), [(self.documents[d], float(scores[i])) for d, i in zip(docs[best], best)]
+
+    def top_terms(self, limit: int = 10) -> list[tuple[str, int, int]]:
+        # (término, veces en todo el corpus, documentos que lo contienen), sin leer los textos
+        best = heapq.nsmallest(limit, self.postings.items(), key=lambda kv: (-kv[1].count, kv[0]))
+        return [(term, p.count, p.df) for term, p in best]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self.documents),
+            "terms": len(self.postings),
+            "postings_bytes": sum(len(p.data) for p in self.postings.values()),
+        }
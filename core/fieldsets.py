@@ -0,0 +1,29 @@
+# Sparse fieldsets: ?fields=id,title,priority para que los listados devuelvan solo esas columnas
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], model: type[BaseModel]) -> Optional[set[str]]:
+    # None = sin filtro (todos los campos). Campos desconocidos -> 400 con la lista válida.
+    if fields is None:
+        return None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - model.model_fields.keys()
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "msg": "Campos inválidos en fields",
+                "invalid": sorted(unknown),
+                "allowed": list(model.model_fields),
+            }
+        )
+    return selected
+
+
+def pick_fields(items: list[BaseModel], selected: Optional[set[str]]) -> list:
+    if selected is None:
+        return items
+    return [item.model_dump(include=selected) for item in items]
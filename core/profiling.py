@@ -0,0 +1,247 @@
+# Perfilado por petición, opt-in (se puede dejar puesto en producción)
+# Una petición se perfila si:
+# - trae la cabecera `X-Profile: <token>` y el token coincide con el configurado, o
+# - cae en el muestreo aleatorio (`sample_rate`, p. ej. 0.01 = 1 de cada 100).
+# Sin token y con sample_rate=0 (lo de por defecto) el middleware solo pasa la petición:
+# no lee cabeceras ni envuelve nada.
+#
+# Modos:
+# - "sampler": un thread toma el stack de los threads ocupados cada `interval` segundos
+#   (wall-clock: cuenta también el tiempo esperando I/O y el trabajo del threadpool).
+#   Resultado en formato "collapsed stacks" (el que usan los flame graphs).
+# - "cprofile": cProfile del thread del event loop (conteo de llamadas y tiempos exactos,
+#   pero no ve el threadpool y cuesta más). Solo uno a la vez: cProfile es por thread.
+# Ojo: en el event loop se intercalan otras peticiones; con mucha concurrencia el perfil
+# también muestra lo que ellas hicieron durante esta.
+#
+# Las peticiones perfiladas que tardan más de `threshold_ms` se guardan (con su ruta) en un
+# anillo acotado en memoria: GET /debug/profiles, que pide el mismo token en X-Profile
+# (los perfiles muestran archivos, líneas y paths con ids). install() pone el middleware y
+# deja el token en app.state.profile_token, de donde lo lee el router de debug.
+import cProfile
+import hmac
+import itertools
+import logging
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+RING_SIZE = 50
+TOP = 30  # filas por perfil (funciones o stacks)
+MAX_DEPTH = 64
+IDLE_FILES = ("threading.py", "queue.py")  # threads del pool esperando trabajo
+
+ring: deque = deque(maxlen=RING_SIZE)
+stats = {
+    "profiled": 0,
+    "stored": 0,
+    "skipped_busy": 0,
+}
+config: dict = {"enabled": False}
+ids = itertools.count(1)
+logger = logging.getLogger("uvicorn.error")
+
+
+def authorized(value, token: str) -> bool:
+    # ¿La cabecera X-Profile trae el token de la app? Sin token, nadie puede leer los perfiles
+    return bool(token) and value is not None and hmac.compare_digest(value.encode(), token.encode())
+
+
+def short_path(filename: str) -> str:
+    parts = filename.replace("\\", "/").rsplit("/", 2)
+    return "/".join(parts[-2:])
+
+
+def collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({short_path(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.endswith(IDLE_FILES) or (frame.f_code.co_name == "_worker" and "concurrent" in filename)
+
+
+class WallClockSampler:
+    def __init__(self, interval: float, loop_thread: int):
+        self.interval = interval
+        self.loop_thread = loop_thread
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.lock = threading.Lock()  # solo mientras se suma una muestra (microsegundos)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self) -> dict:
+        # Sin join(): se llama desde el event loop. Con el lock el thread ya no suma nada
+        # después de esto y termina solo en su próxima vuelta.
+        with self.lock:
+            self.stopped.set()
+            samples = self.samples
+            top = self.counts.most_common(TOP)
+        return {
+            "samples": samples,
+            "interval_ms": round(self.interval * 1000, 3),
+            "stacks": [{"stack": stack, "count": count} for stack, count in top],
+        }
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                # El loop siempre cuenta (si está en select es que espera I/O); los demás
+                # threads solo si están haciendo algo
+                if thread_id != self.loop_thread and is_idle(frame):
+                    continue
+                stacks.append(collapse(frame))
+            with self.lock:
+                if self.stopped.is_set():
+                    return
+                self.samples += 1
+                self.counts.update(stacks)
+
+
+def cprofile_summary(profile: cProfile.Profile) -> dict:
+    rows = sorted(pstats.Stats(profile).stats.items(), key=lambda kv: kv[1][3], reverse=True)[:TOP]
+    return {
+        "functions": [
+            {
+                "function": f"{func} ({short_path(filename)}:{line})",
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+            for (filename, line, func), (_, calls, tottime, cumtime, _) in rows
+        ]
+    }
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        token: str = "",  # valor de X-Profile que activa el perfil ("" = sin cabecera)
+        sample_rate: float = 0.0,  # fracción de peticiones perfiladas al azar
+        threshold_ms: float = 100.0,  # solo se guardan las más lentas que esto
+        mode: str = "sampler",  # "sampler" o "cprofile"
+        interval_ms: float = 5.0,  # cada cuánto muestrea el sampler (no baja del switch interval del GIL, 5 ms)
+        ring_size: int = RING_SIZE,
+        max_active: int = 4,  # perfiles a la vez (cprofile siempre 1)
+        exempt_paths=("/debug", "/events", "/ws"),
+    ):
+        global ring
+        if mode not in ("sampler", "cprofile"):
+            raise ValueError(f"modo de perfilado desconocido: {mode}")
+        self.app = app
+        self.token = token.encode()
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.max_active = 1 if mode == "cprofile" else max_active
+        self.exempt_paths = tuple(exempt_paths)
+        self.active = 0
+        self.enabled = bool(token) or sample_rate > 0
+        if ring.maxlen != ring_size:
+            ring = deque(ring, maxlen=ring_size)
+        config.update(
+            enabled=self.enabled,
+            header=bool(token),
+            sample_rate=sample_rate,
+            threshold_ms=threshold_ms,
+            mode=mode,
+            interval_ms=interval_ms,
+            ring_size=ring_size,
+        )
+
+    def trigger(self, scope) -> str:
+        # "" si esta petición no se perfila
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    if hmac.compare_digest(value, self.token):
+                        return "header"
+                    break
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return ""
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        trigger = self.trigger(scope)
+        if not trigger:
+            await self.app(scope, receive, send)
+            return
+        if self.active >= self.max_active:
+            stats["skipped_busy"] += 1
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.active += 1
+        stats["profiled"] += 1
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = WallClockSampler(self.interval, threading.get_ident())
+            profiler.start()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - t0) * 1000
+            if self.mode == "cprofile":
+                profiler.disable()
+            else:
+                profile = profiler.stop()
+            self.active -= 1
+
+            if duration_ms >= self.threshold_ms:
+                route = scope.get("route")
+                ring.append({
+                    "id": next(ids),
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),  # plantilla, p. ej. /tasks/{task_id}
+                    "status": status,
+                    "duration_ms": round(duration_ms, 3),
+                    "trigger": trigger,
+                    "mode": self.mode,
+                    # el resumen de cProfile se arma solo si se guarda
+                    "profile": cprofile_summary(profiler) if self.mode == "cprofile" else profile,
+                })
+                stats["stored"] += 1
+
+
+def install(app, token: str = "", **options):
+    # El token queda en la app (no en el módulo): cada app decide quién lee sus perfiles
+    app.state.profile_token = token
+    if options.get("sample_rate", 0) > 0 and not token:
+        # Se perfila igual, pero GET /debug/profiles responde 403 a todos
+        logger.warning("PROFILE_SAMPLE_RATE > 0 sin PROFILE_TOKEN: los perfiles se guardan pero nadie puede leerlos")
+    app.add_middleware(ProfilingMiddleware, token=token, **options)
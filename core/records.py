@@ -0,0 +1,25 @@
+# Ids compactos para los stores en memoria
+# Un uuid4 como str ocupa ~85 bytes (36 caracteres + cabecera); como int de 128 bits ~44.
+# Los stores usan el int como clave y solo se formatea a str en la respuesta (borde de la API).
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+def new_id() -> int:
+    return uuid4().int
+
+
+def parse_id(value: str) -> Optional[int]:
+    # None si no es un uuid válido (el handler responde 404 como con cualquier id inexistente).
+    # Solo la forma canónica de 36 caracteres en minúsculas, la misma que se entrega: UUID()
+    # también acepta mayúsculas, hex sin guiones, {...} y urn:uuid:..., que antes (con el id
+    # como str de clave) daban 404.
+    try:
+        parsed = UUID(value)
+    except (ValueError, AttributeError, TypeError):
+        return None
+    return parsed.int if str(parsed) == value else None
+
+
+def format_id(value: int) -> str:
+    return str(UUID(int=value))
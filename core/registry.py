@@ -0,0 +1,55 @@
+# Registro de routers
+# Descubre los módulos de router/ y monta el `router` de cada uno (así ninguno queda sin montar,
+# como pasaba con ejercicio6). Importar un router solo declara rutas y modelos; lo pesado
+# (fixtures, índices, etc.) va en una función opcional `startup()` del módulo, que se corre en
+# el lifespan de la app y no al importar.
+import importlib
+import inspect
+import logging
+import pkgutil
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+
+logger = logging.getLogger("uvicorn.error")
+
+PACKAGE = "router"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / PACKAGE
+
+
+def discover() -> list[str]:
+    return sorted(
+        m.name for m in pkgutil.iter_modules([str(PACKAGE_DIR)])
+        if not m.name.startswith("_")
+    )
+
+
+def include_routers(app: FastAPI) -> None:
+    modules = []
+    import_ms = {}
+    for name in discover():
+        t0 = time.perf_counter()
+        module = importlib.import_module(f"{PACKAGE}.{name}")
+        import_ms[name] = round((time.perf_counter() - t0) * 1000, 3)
+        router = getattr(module, "router", None)
+        if router is None:
+            continue
+        app.include_router(router)
+        modules.append(module)
+    app.state.routers = modules
+    app.state.router_import_ms = import_ms
+
+
+async def run_startup(app: FastAPI) -> dict[str, float]:
+    startup_ms = {}
+    for module in app.state.routers:
+        hook = getattr(module, "startup", None)
+        if hook is None:
+            continue
+        t0 = time.perf_counter()
+        result = hook()
+        if inspect.isawaitable(result):
+            await result
+        startup_ms[module.__name__.rsplit(".", 1)[-1]] = round((time.perf_counter() - t0) * 1000, 3)
+    return startup_ms
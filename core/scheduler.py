@@ -0,0 +1,80 @@
+# Cola de prioridad con "leases" para repartir trabajo entre workers
+# - heap ordenado por prioridad (mayor primero) y luego por orden de creación
+# - claim() entrega el siguiente pendiente y lo "presta" por lease_seconds
+# - si el lease vence sin que se complete, la tarea vuelve a la cola en su lugar original
+# claim/complete no tienen awaits, así que en el event loop son atómicos: dos workers
+# nunca reciben la misma tarea. Cada operación es O(log N) (las entradas viejas del heap
+# se descartan al salir, "lazy deletion").
+import heapq
+import itertools
+import time
+from typing import Hashable, NamedTuple, Optional
+from uuid import uuid4
+
+
+class Lease(NamedTuple):
+    lease_id: str
+    key: Hashable
+    worker: Optional[str]
+    expires_at: float  # time.monotonic()
+
+
+class LeaseQueue:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.ready: list[tuple] = []  # (-prioridad, seq, key)
+        self.entries: dict[Hashable, tuple] = {}  # pendientes (en cola o prestadas)
+        self.leases: dict[Hashable, Lease] = {}
+        self.expirations: list[tuple] = []  # (expires_at, lease_id, key)
+        self.seq = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, key: Hashable, priority: int):
+        entry = (-priority, next(self.seq), key)
+        self.entries[key] = entry
+        heapq.heappush(self.ready, entry)
+
+    def complete(self, key: Hashable):
+        # Sale de la cola para siempre (esté en espera o prestada)
+        self.entries.pop(key, None)
+        self.leases.pop(key, None)
+
+    def reclaim_expired(self, now: float) -> int:
+        returned = 0
+        while self.expirations and self.expirations[0][0] <= now:
+            _, lease_id, key = heapq.heappop(self.expirations)
+            lease = self.leases.get(key)
+            if lease is None or lease.lease_id != lease_id:
+                continue  # ya se completó o se volvió a prestar
+            del self.leases[key]
+            heapq.heappush(self.ready, self.entries[key])
+            returned += 1
+        return returned
+
+    def claim(self, lease_seconds: float, worker: Optional[str] = None,
+              min_priority: Optional[int] = None) -> Optional[Lease]:
+        now = time.monotonic()
+        self.reclaim_expired(now)
+        while self.ready:
+            entry = self.ready[0]
+            key = entry[2]
+            if self.entries.get(key) is not entry or key in self.leases:
+                heapq.heappop(self.ready)  # entrada vieja
+                continue
+            # El heap está ordenado por prioridad: si la primera no alcanza, ninguna alcanza
+            if min_priority is not None and -entry[0] < min_priority:
+                return None
+            heapq.heappop(self.ready)
+            lease = Lease(uuid4().hex, key, worker, now + lease_seconds)
+            self.leases[key] = lease
+            heapq.heappush(self.expirations, (lease.expires_at, lease.lease_id, key))
+            return lease
+        return None
+
+    def stats(self) -> dict:
+        self.reclaim_expired(time.monotonic())
+        return {"pending": len(self.entries) - len(self.leases), "leased": len(self.leases)}
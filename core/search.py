@@ -0,0 +1,120 @@
+# Búsqueda de texto completo: índice invertido incremental + ranking BM25
+# - Tokens sin tildes y en minúsculas ("Reunión" y "reunion" son el mismo término).
+# - Cada término guarda sus postings en dos array.array (nº de documento y frecuencia),
+#   así agregar un documento es O(términos) y el scoring se hace con NumPy sin copiar.
+import math
+import re
+import unicodedata
+from array import array
+from typing import Hashable, Iterable
+
+TOKEN_RE = re.compile(r"\w+", flags=re.UNICODE)
+
+
+def fold(text: str) -> str:
+    # "Técnica" -> "tecnica"
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def fold_tokens(text: str) -> list[str]:
+    return TOKEN_RE.findall(fold(text))
+
+
+def as_numpy(values: array):
+    # Vista sin copia sobre el buffer del array (no agregar al array mientras exista)
+    import numpy as np  # import diferido: NumPy solo se carga en la primera búsqueda
+    return np.frombuffer(values, dtype=np.dtype(f"u{values.itemsize}"))
+
+
+class Postings:
+    __slots__ = ("docs", "tfs")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.tfs = array("I")
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self):
+        self.keys: list[Hashable] = []  # nº de documento -> clave externa (p. ej. task_id)
+        self.doc_numbers: dict[Hashable, int] = {}
+        self.doc_len = array("I")
+        self.total_len = 0
+        self.postings: dict[str, Postings] = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key: Hashable, text: str):
+        if key in self.doc_numbers:
+            raise ValueError(f"documento duplicado en el índice: {key}")
+        tokens = fold_tokens(text)
+        doc = len(self.keys)
+        self.keys.append(key)
+        self.doc_numbers[key] = doc
+        self.doc_len.append(len(tokens))
+        self.total_len += len(tokens)
+
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = Postings()
+            postings.docs.append(doc)
+            postings.tfs.append(tf)
+
+    def rebuild(self, items: Iterable[tuple[Hashable, str]]):
+        self.clear()
+        for key, text in items:
+            self.add(key, text)
+
+    def search(self, query: str, limit: int = 10) -> tuple[int, list[tuple[Hashable, float]]]:
+        # Devuelve (total de documentos que coinciden, [(clave, score)] de los `limit` mejores)
+        n_docs = len(self.keys)
+        terms = set(fold_tokens(query))
+        if n_docs == 0 or not terms:
+            return 0, []
+
+        import numpy as np
+        avgdl = self.total_len / n_docs or 1.0
+        lengths = as_numpy(self.doc_len)
+        parts = []
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            docs = as_numpy(postings.docs)
+            tf = as_numpy(postings.tfs).astype(np.float64)
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / avgdl)
+            parts.append((docs, idf * tf * (self.k1 + 1) / (tf + norm)))
+
+        if not parts:
+            return 0, []
+        if len(parts) == 1:
+            docs, scores = parts[0]
+        else:
+            # Suma por documento de los scores de cada término (bincount = una sola pasada)
+            dense = np.bincount(
+                np.concatenate([d for d, _ in parts]),
+                weights=np.concatenate([sc for _, sc in parts]),
+            )
+            docs = np.flatnonzero(dense)
+            scores = dense[docs]
+
+        if len(docs) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            best = np.arange(len(docs))
+        # Orden final: score desc y, si empatan, el documento más antiguo primero
+        best = best[np.lexsort((docs[best], -scores[best]))]
+        return len(docs), [(self.keys[d], float(scores[i])) for d, i in zip(docs[best], best)]
@@ -0,0 +1,154 @@
+# Similitud ítem a ítem ("más como esta") con una matriz de features en NumPy
+# Cada película es una fila: géneros en one-hot (multi-hot si trae varios), año normalizado
+# y rating normalizado. Las filas se guardan ya con norma 1, así el coseno contra todo el
+# catálogo es un solo producto matriz-vector y el top-K sale con argpartition.
+#
+# La matriz crece por bloques (filas y columnas x2) para que agregar una fila o un género
+# nuevo sea O(1) amortizado. Los géneros son texto libre: a partir de MAX_GENRES los nuevos
+# van todos a una columna "otros", así el ancho de la matriz tiene tope. El año se normaliza
+# en un rango fijo para que una película nueva no obligue a recalcular las demás filas.
+import re
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+GENRE_SPLIT = re.compile(r"[,|/;]")
+YEAR_MIN = 1888  # primera película de la historia
+YEAR_MAX = 2030
+GENRE_WEIGHT = 1.0
+YEAR_WEIGHT = 0.5
+RATING_WEIGHT = 0.5
+INITIAL_CAPACITY = 1024
+INITIAL_COLUMNS = 16
+MAX_GENRES = 256  # columnas de género como máximo (incluida "otros")
+OTHER_GENRE = "\x00otros"  # clave interna de la columna "otros"
+
+
+def split_genres(genres: str) -> list[str]:
+    return [g.strip().lower() for g in GENRE_SPLIT.split(genres) if g.strip()]
+
+
+class SimilarityIndex:
+    def __init__(self, cache_size: int = 10_000):
+        self.cache_size = cache_size
+        self.clear()
+
+    def clear(self):
+        self.keys: list[Hashable] = []
+        self.rows: dict[Hashable, int] = {}
+        self.genres: dict[str, int] = {}  # género -> columna
+        self.matrix = None  # np.ndarray float32 (capacidad x columnas), se crea en el primer uso
+        self.version = 0
+        self.cache: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ---- construcción ----
+    def _genre_columns(self, genres: list[str]) -> list[int]:
+        columns = []
+        for genre in genres:
+            column = self.genres.get(genre)
+            if column is None:
+                if len(self.genres) < MAX_GENRES - 1:
+                    column = self.genres[genre] = len(self.genres)
+                else:
+                    column = self.genres.setdefault(OTHER_GENRE, len(self.genres))
+            columns.append(column)
+        return list(dict.fromkeys(columns))  # varios géneros en "otros" cuentan una vez
+
+    def _ensure_shape(self, rows: int):
+        import numpy as np  # import diferido: NumPy se carga con la primera película
+        n_cols = len(self.genres) + 2  # + año + rating
+        if self.matrix is None:
+            self.matrix = np.zeros((max(INITIAL_CAPACITY, rows), max(INITIAL_COLUMNS, n_cols)), dtype=np.float32)
+            return
+        capacity, cols = self.matrix.shape
+        if rows <= capacity and n_cols <= cols:
+            return
+        # Las columnas sin usar quedan en 0 y no cambian el coseno
+        grown = np.zeros((max(rows, capacity * 2) if rows > capacity else capacity,
+                          max(n_cols, cols * 2) if n_cols > cols else cols),
+                         dtype=np.float32)
+        used = len(self.keys)
+        # Las columnas de año/rating son las dos últimas: se mueven al final del nuevo ancho
+        grown[:used, :cols - 2] = self.matrix[:used, :cols - 2]
+        grown[:used, -2:] = self.matrix[:used, -2:]
+        self.matrix = grown
+
+    def _features(self, columns: list[int], year: int, rating: float):
+        import numpy as np
+        row = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        if columns:
+            row[columns] = GENRE_WEIGHT / len(columns) ** 0.5
+        row[-2] = YEAR_WEIGHT * (min(max(year, YEAR_MIN), YEAR_MAX) - YEAR_MIN) / (YEAR_MAX - YEAR_MIN)
+        row[-1] = RATING_WEIGHT * rating / 10
+        norm = float(np.linalg.norm(row))
+        return row / norm if norm else row
+
+    def add(self, key: Hashable, genres: str, year: int, rating: float):
+        if key in self.rows:
+            raise ValueError(f"película duplicada en el índice: {key}")
+        columns = self._genre_columns(split_genres(genres))
+        self._ensure_shape(len(self.keys) + 1)
+        row = len(self.keys)
+        self.matrix[row] = self._features(columns, year, rating)
+        self.keys.append(key)
+        self.rows[key] = row
+        self.version += 1
+
+    def rebuild(self, items: Iterable[tuple[Hashable, str, int, float]]):
+        # Carga masiva vectorizada (sin un add() por fila)
+        self.clear()
+        items = list(items)
+        if not items:
+            return  # catálogo vacío (el arranque normal): NumPy ni se importa
+        import numpy as np
+        genre_cols = []
+        for key, genres, _, _ in items:
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            genre_cols.append(self._genre_columns(split_genres(genres)))
+        self._ensure_shape(len(items))
+        n = len(items)
+        r_idx = np.repeat(np.arange(n), [len(c) for c in genre_cols])
+        c_idx = np.fromiter((c for cols in genre_cols for c in cols), dtype=np.int64, count=len(r_idx))
+        counts = np.array([max(len(c), 1) for c in genre_cols], dtype=np.float32)
+        block = self.matrix[:n]
+        block[r_idx, c_idx] = GENRE_WEIGHT / np.sqrt(counts[r_idx])
+        years = np.clip(np.array([it[2] for it in items], dtype=np.float32), YEAR_MIN, YEAR_MAX)
+        block[:, -2] = YEAR_WEIGHT * (years - YEAR_MIN) / (YEAR_MAX - YEAR_MIN)
+        block[:, -1] = RATING_WEIGHT * np.array([it[3] for it in items], dtype=np.float32) / 10
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block, norms, out=block, where=norms > 0)
+        self.version += 1
+
+    # ---- consultas ----
+    def similar(self, key: Hashable, limit: int = 10) -> Optional[list[tuple[Hashable, float]]]:
+        # None si la película no está en el índice
+        import numpy as np
+        row = self.rows.get(key)
+        if row is None:
+            return None
+
+        cache_key = (key, limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None and cached[0] == self.version:
+            self.cache.move_to_end(cache_key)
+            return cached[1]
+
+        n = len(self.keys)
+        scores = self.matrix[:n] @ self.matrix[row]
+        scores[row] = -np.inf  # la misma película no cuenta
+        k = min(limit, n - 1)
+        if k <= 0:
+            result = []
+        else:
+            best = np.argpartition(-scores, k - 1)[:k]
+            # score desc y, si empatan, la más antigua primero
+            best = best[np.lexsort((best, -scores[best]))]
+            result = [(self.keys[i], round(float(scores[i]), 6)) for i in best]
+
+        self.cache[cache_key] = (self.version, result)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
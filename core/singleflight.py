@@ -0,0 +1,87 @@
+# Single-flight: peticiones idénticas concurrentes comparten un solo cálculo
+# La primera petición con una clave lanza el cálculo; las que llegan mientras sigue en curso
+# esperan esa misma tarea y reciben el mismo resultado (o la misma excepción).
+#
+# OJO: un handler async sin awaits corre de principio a fin sin soltar el event loop, así que
+# nunca habría dos "a la vez". Para que esto sirva, el trabajo pesado del handler debe ir a un
+# thread (run_in_threadpool) sobre una copia de los datos que lee.
+import asyncio
+import inspect
+import json
+from functools import wraps
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.inflight: dict[Any, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+        self.errors = 0
+
+    async def do(self, key, fn: Callable[[], Awaitable]):
+        self.calls += 1
+        task = self.inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self.inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.deduplicated += 1
+        # shield: si un cliente se desconecta, el cálculo sigue para los demás que esperan
+        return await asyncio.shield(task)
+
+    def _done(self, key, task: asyncio.Task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "errors": self.errors,
+            "inflight": len(self.inflight),
+        }
+
+
+groups: dict[str, SingleFlight] = {}
+
+
+def get_group(name: str) -> SingleFlight:
+    if name not in groups:
+        groups[name] = SingleFlight(name)
+    return groups[name]
+
+
+def default_key(signature: inspect.Signature, args, kwargs) -> str:
+    # Clave = hash del JSON canónico de todos los argumentos (bodies, query y path params)
+    bound = signature.bind(*args, **kwargs)
+    raw = json.dumps(jsonable_encoder(bound.arguments), sort_keys=True, separators=(",", ":"))
+    return blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def coalesce(name: str, key: Optional[Callable[..., Any]] = None):
+    # Decorador para handlers: @coalesce("movies.recommend", key=lambda req: ...)
+    # `key` recibe los mismos argumentos que el handler; por defecto se usan todos.
+    group = get_group(name)
+
+    def decorator(handler):
+        signature = inspect.signature(handler)
+
+        @wraps(handler)  # FastAPI lee la firma original a través de __wrapped__
+        async def wrapper(*args, **kwargs):
+            k = key(*args, **kwargs) if key else default_key(signature, args, kwargs)
+            return await group.do(k, lambda: handler(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
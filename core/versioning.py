@@ -0,0 +1,58 @@
+# Versionado de stores + ETags para GET condicionales
+# Cada store en memoria tiene un contador que sube en cada escritura. El ETag de una
+# respuesta sale de (versiones de los stores que lee + query params), así que si nada
+# cambió el cliente recibe un 304 sin que se filtre ni se serialice nada.
+from hashlib import sha1
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Response
+
+# Cambia en cada arranque: tras un reinicio los contadores vuelven a 0 con datos distintos
+EPOCH = uuid4().hex[:8]
+
+store_versions: dict[str, int] = {}
+
+
+def bump(store: str) -> int:
+    store_versions[store] = store_versions.get(store, 0) + 1
+    return store_versions[store]
+
+
+def version(store: str) -> int:
+    return store_versions.get(store, 0)
+
+
+def make_etag(stores: tuple[str, ...], *params) -> str:
+    raw = "|".join([EPOCH] + [f"{s}={version(s)}" for s in stores] + [repr(p) for p in params])
+    return '"' + sha1(raw.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":  # quien llama ya comprobó que el recurso existe
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_get(
+    if_none_match: Optional[str],
+    response: Response,
+    stores: tuple[str, ...],
+    *params
+) -> Optional[Response]:
+    # Devuelve un 304 listo si el cliente ya tiene la versión actual;
+    # si no, deja el ETag puesto en la respuesta normal y devuelve None.
+    etag = make_etag(stores, *params)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
@@ -1,10 +1,61 @@
+import os
+import time
+IMPORT_STARTED = time.perf_counter() # Para medir el arranque en frío (import + lifespan)
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from router import ejercicio1, ejercicio2, ejercicio3, ejercicio4, ejercicio5
+from core import profiling, registry
+from core.admission import AdmissionMiddleware
+from core.compression import CompressionMiddleware
+
+# Lo pesado de cada router (fixtures, índices...) se carga aquí y no al importar
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_ms = await registry.run_startup(app)
+    app.state.cold_start = {
+        "import_ms": round((IMPORTS_DONE - IMPORT_STARTED) * 1000, 3),
+        "routers_import_ms": app.state.router_import_ms,
+        "startup_ms": startup_ms,
+        "total_ms": round((time.perf_counter() - IMPORT_STARTED) * 1000, 3),
+    }
+    registry.logger.info("Cold start: %s", app.state.cold_start)
+    yield
 
-app = FastAPI()
+app = FastAPI(lifespan = lifespan)
 
 origin = ["*"]
 
+# Comprime (br/gzip) las respuestas de 1 KB o más, p. ej. /tasks_all o /history_conversion_all
+app.add_middleware(CompressionMiddleware, minimum_size = 1024)
+
+# Perfilado opt-in de peticiones lentas (GET /debug/profiles). Apagado si no hay
+# PROFILE_TOKEN (cabecera X-Profile) ni PROFILE_SAMPLE_RATE > 0; así no cuesta nada.
+# Para leer los perfiles hace falta PROFILE_TOKEN: con solo PROFILE_SAMPLE_RATE se perfila,
+# pero GET /debug/profiles da 403 (se avisa con un warning al arrancar)
+profiling.install(
+    app,
+    token = os.environ.get("PROFILE_TOKEN", ""), # también es el que pide GET /debug/profiles
+    sample_rate = float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+    threshold_ms = float(os.environ.get("PROFILE_THRESHOLD_MS", "100")),
+    mode = os.environ.get("PROFILE_MODE", "sampler"), # "sampler" o "cprofile"
+    interval_ms = float(os.environ.get("PROFILE_INTERVAL_MS", "5")),
+    ring_size = int(os.environ.get("PROFILE_RING_SIZE", "50")),
+)
+
+# Control de admisión (va por fuera de todo: rechaza antes de hacer cualquier trabajo)
+# Se configura por variables de entorno; ADMISSION_ENABLED=0 lo apaga (p. ej. en benchmarks)
+if os.environ.get("ADMISSION_ENABLED", "1") != "0":
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate = float(os.environ.get("ADMISSION_RATE", "50")), # tokens/s por cliente
+        burst = float(os.environ.get("ADMISSION_BURST", "100")),
+        max_concurrency = int(os.environ.get("ADMISSION_MAX_CONCURRENCY", "256")),
+        max_body_bytes = int(os.environ.get("ADMISSION_MAX_BODY_BYTES", str(1024 * 1024))),
+        max_limit = int(os.environ.get("ADMISSION_MAX_LIMIT", "1000")),
+        # Cuántos proxies propios agregan X-Forwarded-For (0 = usar la IP de la conexión)
+        trusted_proxies = int(os.environ.get("ADMISSION_TRUSTED_PROXIES", "0")),
+    )
+
 # Con esto pruebo si mi servidor funciona!
 @app.get("/")
 async def root():
@@ -12,8 +63,7 @@ async def root():
         "msg" : "Servidor"
     }
 
-app.include_router(ejercicio1.router)
-app.include_router(ejercicio2.router)
-app.include_router(ejercicio3.router)
-app.include_router(ejercicio4.router)
-app.include_router(ejercicio5.router)
+# Monta todos los routers de router/ (ejercicio1 ... ejercicio6)
+registry.include_routers(app)
+
+IMPORTS_DONE = time.perf_counter()
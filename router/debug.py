@@ -0,0 +1,62 @@
+# Endpoints de diagnóstico (métricas internas de la app)
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+
+from core import admission, changefeed, profiling, singleflight
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"]
+)
+
+
+# GET /debug/singleflight
+# Cuántas peticiones se calcularon y cuántas se ahorraron por coalescing, por grupo
+@router.get("/singleflight")
+async def singleflight_stats():
+    return {
+        "msg": "",
+        "data": {name: group.stats() for name, group in singleflight.groups.items()}
+    }
+
+
+# GET /debug/changefeed
+# Suscriptores conectados y eventos publicados / entregados / clientes expulsados por lentos
+@router.get("/changefeed")
+async def changefeed_stats():
+    return {
+        "msg": "",
+        "data": changefeed.feed.stats()
+    }
+
+
+# GET /debug/admission
+# Peticiones admitidas, rechazadas por motivo (body, limit, rate, overload) y en curso
+@router.get("/admission")
+async def admission_stats():
+    return {
+        "msg": "",
+        "data": admission.stats
+    }
+
+
+# GET /debug/profiles
+# Últimas peticiones perfiladas que pasaron el umbral (más nuevas primero), con su perfil
+# - route: solo las de esa ruta (la plantilla, p. ej. /tasks/{task_id})
+# Pide el mismo token que activa el perfil (cabecera X-Profile); sin PROFILE_TOKEN, 403 siempre
+@router.get("/profiles")
+async def profiles(
+    request: Request,
+    route: Optional[str] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=1000),
+    x_profile: Optional[str] = Header(default=None)
+):
+    if not profiling.authorized(x_profile, getattr(request.app.state, "profile_token", "")):
+        raise HTTPException(status_code=403, detail="Falta el token de X-Profile")
+    entries = [e for e in reversed(profiling.ring) if route is None or e["route"] == route]
+    return {
+        "msg": "",
+        "meta": {"config": profiling.config, "stats": profiling.stats, "total": len(entries)},
+        "data": entries[:limit]
+    }
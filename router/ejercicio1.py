@@ -6,10 +6,14 @@
 # 2. GET /tasks/{task_id}
 # 3. GET /tasks
 # 4. PATCH /tasks/{tasks_id}/complete
+from datetime import datetime, timedelta
 from typing import Optional
-from uuid import uuid4
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel, Field
+from core import changefeed, fieldsets, versioning
+from core.records import format_id, new_id, parse_id
+from core.scheduler import LeaseQueue
+from core.search import BM25Index
 
 # Llama tu router!
 router = APIRouter(
@@ -36,52 +40,102 @@ class TasksCreate(BaseModel): # Esto es para cliente, es decir es solo lo que va
     description: Optional[str] = None
     priority: int = Field(...,ge = 1, le = 5)
 
-# Para guardar mis tasks
-# tasks_repertory: dict[str,Task] = {}
+class TaskClaim(BaseModel): # Lo que manda un worker para pedir la siguiente tarea
+    worker: Optional[str] = None
+    lease_seconds: int = Field(default = 60, ge = 1, le = 3600)
+    min_priority: Optional[int] = Field(default = None, ge = 1, le = 5)
+
+# Lo que de verdad se guarda: un registro compacto (sin __dict__ ni validación de Pydantic)
+# con el id como int de 128 bits. Task (Pydantic) se arma solo al responder.
+class TaskRecord:
+    __slots__ = ("id", "title", "description", "priority", "complete")
+
+    def __init__(self, id: int, title: str, description: Optional[str], priority: int, complete: bool = False):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.complete = complete
+
+    def to_model(self) -> Task:
+        # model_construct: los datos ya se validaron al entrar, no hace falta validarlos otra vez
+        return Task.model_construct(
+            id = format_id(self.id),
+            title = self.title,
+            description = self.description,
+            priority = self.priority,
+            complete = self.complete
+        )
+
+# Para guardar mis tasks (clave = id como int)
+tasks_repertory: dict[int,TaskRecord] = {}
 # OJO: Para agilizar las pruebas vamos a precargar unos datos
-tasks_repertory : dict[str,Task] = {
-    "60799464-972d-419b-857e-379664f33b91": Task(
+# (se cargan en startup(), al arrancar la app, y no al importar el módulo)
+TASKS_FIXTURES = [
+    dict(
         id="60799464-972d-419b-857e-379664f33b91",
         title="Optimizar consultas SQL",
         description="Agregar índices a la tabla de usuarios para mejorar el tiempo de respuesta.",
         priority=5,
         complete=False
     ),
-    "a1b2c3d4-e5f6-4a5b-bc6d-7e8f9a0b1c2d": Task(
+    dict(
         id="a1b2c3d4-e5f6-4a5b-bc6d-7e8f9a0b1c2d",
         title="Corregir estilos CSS",
         description="Ajustar el padding del contenedor principal en dispositivos móviles.",
         priority=2,
         complete=True
     ),
-    "f1234567-89ab-cdef-0123-456789abcdef": Task(
+    dict(
         id="f1234567-89ab-cdef-0123-456789abcdef",
         title="Reunión técnica",
         description="Definir la arquitectura de microservicios para el nuevo módulo.",
         priority=4,
         complete=False
     ),
-    "99887766-5544-3322-1100-aabbccddeeff": Task(
+    dict(
         id="99887766-5544-3322-1100-aabbccddeeff",
         title="Actualizar README",
         description="Incluir instrucciones sobre cómo configurar las variables de entorno.",
         priority=1,
         complete=True
     ),
-    "550e8400-e29b-41d4-a716-446655440000": Task(
+    dict(
         id="550e8400-e29b-41d4-a716-446655440000",
         title="Pruebas de integración",
         description="Ejecutar suite de tests en el entorno de staging.",
         priority=3,
         complete=False
     )
-}
+]
+
+# Índice invertido para GET /tasks/search (título + descripción), se actualiza en cada POST /tasks
+tasks_index = BM25Index()
+# Cola de tareas abiertas para POST /tasks/next (prioridad desc, luego orden de creación)
+tasks_queue = LeaseQueue()
+
+def task_text(task: TaskRecord) -> str:
+    return f"{task.title} {task.description or ''}"
+
+def reindex_tasks():
+    tasks_index.rebuild((task_id, task_text(task)) for task_id, task in tasks_repertory.items())
+    tasks_queue.clear()
+    for task_id, task in tasks_repertory.items():
+        if not task.complete:
+            tasks_queue.push(task_id, task.priority)
+
+def startup():
+    for data in TASKS_FIXTURES:
+        task_id = parse_id(data["id"])
+        tasks_repertory.setdefault(task_id, TaskRecord(**{**data, "id": task_id}))
+    reindex_tasks()
+    versioning.bump("tasks")
 
 @router.post("/tasks")
 async def createTasks(payload: TasksCreate):
-    task_id = str(uuid4()) # Creación del id
+    task_id = new_id() # Creación del id
     
-    task = Task(
+    record = TaskRecord(
         id = task_id, # lo de arriba pues hijito xd
         title = payload.title, # Traemos todos estos por el payload
         description = payload.description,
@@ -89,18 +143,45 @@ async def createTasks(payload: TasksCreate):
         complete = False
     )
     
-    tasks_repertory[task_id] = task # Ahora los meto dentro del diccionario
+    tasks_repertory[task_id] = record # Ahora los meto dentro del diccionario
+    tasks_index.add(task_id, task_text(record)) # y al índice de búsqueda
+    tasks_queue.push(task_id, record.priority) # y a la cola de pendientes
+    versioning.bump("tasks") # Cada escritura sube la versión del store (invalida los ETags)
+    task = record.to_model()
+    changefeed.publish("tasks", "task.created", task) # Aviso a los suscriptores (SSE / WebSocket)
     return {
         "msg" : "task created",
         "data" : task # Esto se usará siempre, cuando se llama este te mostrará toda la info del Task correspondiente!
     }
     
+# GET /tasks/search?q=
+# - Busca palabras en title y description (sin importar tildes ni mayúsculas)
+# - Resultados ordenados por relevancia (BM25)
+# OJO: va antes de /tasks/{task_id}, si no "search" se tomaría como un id
+@router.get("/tasks/search")
+async def searchTasks(
+    q: str = Query(..., min_length = 1),
+    limit: int = Query(default = 10, ge = 1, le = 100)
+):
+    total, hits = tasks_index.search(q, limit)
+    return {
+        "msg": "",
+        "meta": {
+            "total": total,
+            "limit": limit
+        },
+        "data": [
+            {"score": round(score, 4), "task": tasks_repertory[task_id].to_model()}
+            for task_id, score in hits
+        ]
+    }
+
 # 2. GET /tasks/{task_id}
 # - Path param: task_id
 # - Devuelve la tarea o 404.
 @router.get("/tasks/{task_id}") # por path param
 async def getTask(task_id: str):
-    task = tasks_repertory.get(task_id) # buscaremos si está el id en todo nuestro repertorio
+    task = tasks_repertory.get(parse_id(task_id)) # buscaremos si está el id en todo nuestro repertorio
     
     #   Si no está
     if not task:
@@ -112,15 +193,26 @@ async def getTask(task_id: str):
     # Si lo encuentra    
     return {
         "msg" : "",
-        "data" : task
+        "data" : task.to_model()
     }
 # Tenemos algo con qué buscar y determinar según un id, pero nos vendría bien tener una lista de todos los tasks que tenemos!
 
 @router.get("/tasks_all")
-async def getAllTasksAll():
+async def getAllTasksAll(
+    response: Response,
+    # fields=id,title,priority -> solo esas columnas (menos bytes y menos serialización)
+    fields: Optional[str] = Query(default = None),
+    if_none_match: Optional[str] = Header(default = None)
+):
+    selected = fieldsets.parse_fields(fields, Task)
+    # Si el cliente ya tiene esta versión del store, 304 sin recorrer ni serializar nada
+    not_modified = versioning.conditional_get(if_none_match, response, ("tasks",), fields)
+    if not_modified:
+        return not_modified
+
     return {
         "msg": "",
-        "data": list(tasks_repertory.values())
+        "data": fieldsets.pick_fields([task.to_model() for task in tasks_repertory.values()], selected)
     }
 
 # 3. GET /tasks
@@ -143,9 +235,11 @@ async def getListTaskFiltrado(
     # - Validar que priority esté entre 1 y 5. OK
     min_priority: Optional[int] = Query(default = None, ge = 1, le = 5),
     skip: Optional[int] = Query(default = 0, ge = 0),
-    limit: Optional[int] = Query(default = 10)
+    limit: Optional[int] = Query(default = 10, le = 1000), # tope propio, aunque el control de admisión esté apagado
+    fields: Optional[str] = Query(default = None)
 ):
-    filtered: list[Task] = [] # Se crea una lista de objetos Tasks y la inicializo vacía
+    selected = fieldsets.parse_fields(fields, Task)
+    filtered: list[TaskRecord] = [] # Se crea una lista de objetos Tasks y la inicializo vacía
     for task in tasks_repertory.values():
         if complete is not None and task.complete != complete: # Se filtran las que son completadas
             continue
@@ -166,7 +260,7 @@ async def getListTaskFiltrado(
             "skip" : skip,
             "limit" : limit
         },
-        "data" : lista_parcial
+        "data" : fieldsets.pick_fields([task.to_model() for task in lista_parcial], selected)
         # "data": filtered
     }
 
@@ -175,7 +269,8 @@ async def getListTaskFiltrado(
 # - Marca la tarea como completada.
 @router.patch("/tasks/{task_id}/complete")
 async def TaskComplete(task_id: str):
-    task = tasks_repertory.get(task_id)
+    key = parse_id(task_id)
+    task = tasks_repertory.get(key)
 
     if not task:
         raise HTTPException(
@@ -183,10 +278,37 @@ async def TaskComplete(task_id: str):
             detail="Task not found in this repository"
         )
 
-    task.complete = True # Manipula directamente
-    tasks_repertory[task_id] = task # Actualiza la task en el repertorio
+    task.complete = True # Manipula directamente (el registro es mutable)
+    tasks_queue.complete(key) # Sale de la cola (y se libera su lease si lo tenía)
+    versioning.bump("tasks")
+    model = task.to_model()
+    changefeed.publish("tasks", "task.completed", model)
 
     return {
         "msg": "task completed",
-        "data": task
+        "data": model
+    }
+
+# 5. POST /tasks/next
+# - Body (JSON, opcional): { "worker": str | null, "lease_seconds": int, "min_priority": int | null }
+# - Entrega la tarea abierta de mayor prioridad (y más antigua) y la "presta" al worker.
+# - Si el worker no la completa (PATCH /tasks/{task_id}/complete) antes de que venza
+#   el lease, vuelve a la cola para otro worker.
+# - 204 si no hay tareas pendientes.
+@router.post("/tasks/next")
+async def claimNextTask(payload: Optional[TaskClaim] = None):
+    payload = payload or TaskClaim()
+    lease = tasks_queue.claim(payload.lease_seconds, payload.worker, payload.min_priority)
+    if lease is None:
+        return Response(status_code = 204)
+
+    return {
+        "msg": "task claimed",
+        "data": tasks_repertory[lease.key].to_model(),
+        "lease": {
+            "lease_id": lease.lease_id,
+            "worker": lease.worker,
+            "lease_seconds": payload.lease_seconds,
+            "expires_at": (datetime.utcnow() + timedelta(seconds = payload.lease_seconds)).isoformat()
+        }
     }
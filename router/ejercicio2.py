@@ -7,6 +7,7 @@ from typing import Literal, Optional
 from uuid import uuid4
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from core import changefeed, fieldsets, versioning
 
 # Llama tu router!
 router = APIRouter(
@@ -117,6 +118,8 @@ async def convert(req: ConvertRequest):
     # Se añade al historial de conversiones
     # append a la lista de historial de conversiones
     history_conversion.append(conversion)
+    versioning.bump("conversions")
+    changefeed.publish("conversions", "conversion.added", conversion)
     
     return{
         "result" : resp,
@@ -125,17 +128,24 @@ async def convert(req: ConvertRequest):
 
 ## Listar todas mis conversiones
 @router.get("/history_conversion_all")
-async def getAllHistoryConversion():
+async def getAllHistoryConversion(
+    fields: Optional[str] = Query(default = None) # ej. fields=id,category,result
+):
+    selected = fieldsets.parse_fields(fields, Conversion)
     return{
         "msg" : "",
-        "data" : history_conversion
+        "data" : fieldsets.pick_fields(history_conversion, selected)
     }
 
 # 2. GET /history/{category}
 # - Path param: category
 # - Devuelve conversiones previas de esa categoría.
 @router.get("/history/{category}") # por path param
-async def filtrarHistorialCategory(category: str):
+async def filtrarHistorialCategory(
+    category: str,
+    fields: Optional[str] = Query(default = None)
+):
+    selected = fieldsets.parse_fields(fields, Conversion)
     historial_filtrado: list[Conversion] = []
     for conversion in history_conversion:
         if conversion.category != category:
@@ -144,7 +154,7 @@ async def filtrarHistorialCategory(category: str):
     
     return{
         "msg" : "",
-        "data" : historial_filtrado
+        "data" : fieldsets.pick_fields(historial_filtrado, selected)
     }
     
 # 3. GET /history
@@ -155,8 +165,10 @@ async def filtrarHistorialCategory(category: str):
 @router.get("/history")
 async def getFiltroHistory(
     category: Optional[str] = Query(default = None),
-    min_value: Optional[float] = Query(default = None)
+    min_value: Optional[float] = Query(default = None),
+    fields: Optional[str] = Query(default = None)
 ):
+    selected = fieldsets.parse_fields(fields, Conversion)
     filtrado_x_categoria: list[Conversion] = []
     for conversion in history_conversion:
         if category is not None and conversion.category != category:
@@ -167,5 +179,5 @@ async def getFiltroHistory(
 
     return {
         "msg": "",
-        "data" : filtrado_x_categoria
+        "data" : fieldsets.pick_fields(filtrado_x_categoria, selected)
     }
\ No newline at end of file
@@ -2,9 +2,10 @@
 # Contexto
 # API que valida datos de registro (sin guardar nada), ideal para practicar validaciones.
 import re
-from typing import Optional
+from typing import NamedTuple, Optional
 from fastapi import APIRouter, Query
 from pydantic import BaseModel, EmailStr, Field
+from core import breached, changefeed, versioning
 
 router = APIRouter(
     prefix = "",
@@ -23,7 +24,23 @@ class UsuarioType(BaseModel):
     password: str
     age : int
 
-history_users : list[UsuarioType] = []
+# Registro compacto (tupla) en lugar de guardar el modelo de Pydantic entero
+class UsuarioRecord(NamedTuple):
+    username : str
+    email : str
+    password : str
+    age : int
+
+history_users : list[UsuarioRecord] = []
+
+# Lista local de contraseñas filtradas (SHA-1 ordenados en un archivo con mmap, ver core/breached.py)
+# Se activa con BREACHED_PASSWORDS_PATH; sin esa variable el chequeo queda apagado
+breached_passwords: Optional[breached.BreachedHashes] = None
+
+def startup():
+    global breached_passwords
+    if breached_passwords is None:
+        breached_passwords = breached.open_from_env()
 
 # 1. POST /register/validate
 # - username (3–20)
@@ -58,6 +75,9 @@ async def RegistrarUsuario(user : UsuarioType):
         errores.append("La contraseña debe tener al menos de 8 caracteres")
     if not re.search(r'\d', user.password):
         errores.append("La contraseña debe tener al menos un número")
+    # O(log N) sobre el archivo mapeado: unas ~30 lecturas aunque la lista sea enorme
+    if breached_passwords is not None and breached_passwords.contains(user.password):
+        errores.append("La contraseña aparece en una lista de contraseñas filtradas")
     
     # validamos age
     if user.age < 13:
@@ -72,7 +92,10 @@ async def RegistrarUsuario(user : UsuarioType):
         }
     else:
         # Si todo está bien se coloca!
-        history_users.append(user)
+        history_users.append(UsuarioRecord(user.username, user.email, user.password, user.age))
+        versioning.bump("users")
+        # Solo el username: la contraseña no sale nunca en el feed
+        changefeed.publish("users", "user.registered", {"username": user.username})
         return{
             "ok": True
         }
@@ -102,14 +125,20 @@ async def isAvailable(username: str):
 async def rules_pass(
     lang: Optional[str] = Query(default = "es")
 ):
+    # Cuántos hashes tiene la lista de filtradas (0 = chequeo apagado)
+    filtradas = len(breached_passwords) if breached_passwords is not None else 0
     if lang == "es" or lang == "en":
         if lang == "es":
             return{
                 "reglas" : "minimo 8 caracteres y al menos 1 número"
+                    + (" y no estar en la lista de contraseñas filtradas" if filtradas else ""),
+                "filtradas" : {"activo": filtradas > 0, "hashes": filtradas}
             }
         else:
             return{
                 "rules" : "minimum 8 characters and at least 1 number"
+                    + (" and not be in the breached passwords list" if filtradas else ""),
+                "breached" : {"enabled": filtradas > 0, "hashes": filtradas}
             }
     else:
         return{
@@ -2,10 +2,14 @@
 # Contexto
 # API que maneja un catálogo en memoria y recomienda películas por criterios.
 
-from typing import Optional
-from uuid import uuid4
-from fastapi import APIRouter, HTTPException, Query
+from typing import NamedTuple, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
+from core import changefeed, fieldsets, versioning
+from core.records import format_id, new_id, parse_id
+from core.similarity import SimilarityIndex
+from core.singleflight import coalesce
 
 
 router = APIRouter(
@@ -32,14 +36,42 @@ class Solicitud(BaseModel):
     min_year: Optional[int] = None
     max_results: int
     
-movies_history: dict[str,Pelicula] = {}
+# Registro compacto que se guarda en memoria (id como int); Pelicula solo se arma al responder
+class PeliculaRecord(NamedTuple):
+    id : int
+    title : str
+    genres : str
+    year : int
+    rating : float
+
+    def to_model(self) -> Pelicula:
+        return Pelicula.model_construct(
+            id = format_id(self.id),
+            title = self.title,
+            genres = self.genres,
+            year = self.year,
+            rating = self.rating
+        )
+
+movies_history: dict[int,PeliculaRecord] = {}
+
+# Matriz de features para GET /movies/{movie_id}/similar; crece con cada POST /movies
+movies_similarity = SimilarityIndex()
+
+def reindex_movies():
+    movies_similarity.rebuild(
+        (movie_id, movie.genres, movie.year, movie.rating) for movie_id, movie in movies_history.items()
+    )
+
+def startup():
+    reindex_movies()
 
 # 1. POST /movies
 @router.post("/movies")
 async def createMovies(movies: PeliculaCreate):
-    movie_id = str(uuid4())
+    movie_id = new_id()
     
-    movie = Pelicula(
+    record = PeliculaRecord(
         id = movie_id,
         title = movies.title,
         genres = movies.genres,
@@ -47,7 +79,11 @@ async def createMovies(movies: PeliculaCreate):
         rating = movies.rating
     )
     
-    movies_history[movie_id] = movie
+    movies_history[movie_id] = record
+    movies_similarity.add(movie_id, record.genres, record.year, record.rating)
+    versioning.bump("movies")
+    movie = record.to_model()
+    changefeed.publish("movies", "movie.created", movie)
     return {
         "msg" : "película creada",
         "data" : movie
@@ -56,7 +92,7 @@ async def createMovies(movies: PeliculaCreate):
 # - Path param: movie_id
 @router.get("/movies/{movie_id}")
 async def movieXID(movie_id: str):
-    movie = movies_history.get(movie_id)
+    movie = movies_history.get(parse_id(movie_id))
     
     if not movie:
         raise HTTPException(
@@ -66,8 +102,30 @@ async def movieXID(movie_id: str):
     
     return {
         "msg": "",
-        "data" : movie
+        "data" : movie.to_model()
+    }
+# GET /movies/{movie_id}/similar
+# - Las `limit` películas más parecidas (géneros, año y rating) por similitud coseno
+@router.get("/movies/{movie_id}/similar")
+async def similarMovies(
+    movie_id: str,
+    limit: int = Query(default = 10, ge = 1, le = 100)
+):
+    similares = movies_similarity.similar(parse_id(movie_id), limit)
+    if similares is None:
+        raise HTTPException(
+            status_code = 404,
+            detail = "Movie not found in this reposotory"
+        )
+
+    return {
+        "msg": "",
+        "data": [
+            {"score": score, "movie": movies_history[similar_id].to_model()}
+            for similar_id, score in similares
+        ]
     }
+
 # 3. GET /movies
 # - Query params:
 # - genre: str | null
@@ -75,11 +133,20 @@ async def movieXID(movie_id: str):
 # - year: int | null
 @router.get("/movies")
 async def filtraMovies(
+    response: Response,
     genre: Optional[str] = Query(default = None),
     min_rating: Optional[float] = Query(default = None),
-    year: Optional[int] = Query(default = None)
+    year: Optional[int] = Query(default = None),
+    fields: Optional[str] = Query(default = None),
+    if_none_match: Optional[str] = Header(default = None)
 ):
-    filtrado: list[Pelicula] = []
+    selected = fieldsets.parse_fields(fields, Pelicula)
+    # ETag = versión del catálogo + filtros; si coincide, 304 antes de filtrar
+    not_modified = versioning.conditional_get(if_none_match, response, ("movies",), genre, min_rating, year, fields)
+    if not_modified:
+        return not_modified
+
+    filtrado: list[PeliculaRecord] = []
     for movie in movies_history.values():
         if genre is not None and movie.genres != genre:
             continue
@@ -91,22 +158,16 @@ async def filtraMovies(
     
     return {
         "msg" : "",
-        "data" : filtrado
+        "data" : fieldsets.pick_fields([movie.to_model() for movie in filtrado], selected)
     }
 # 4. POST /movies/recommend
 # - Body (JSON):
 # { "preferred_genres": [str], "min_year": int | null, "max_results": int }
 # - Devuelve lista ordenada (por rating desc).
-@router.post("/movies/recommend")
-async def recommend_movies(req: Solicitud):
-    if req.max_results <= 0:
-        raise HTTPException(
-            status_code=400, detail="max_results debe ser mayor que 0"
-        )
-    
-    candidatos: list[Pelicula] = []
+def rank_movies(movies: list[PeliculaRecord], req: Solicitud) -> list[Pelicula]:
+    candidatos: list[PeliculaRecord] = []
     
-    for movie in movies_history.values():
+    for movie in movies:
         # Si no es None ni es menor al año mínimo, entonces
         if req.min_year is not None and movie.year < req.min_year:
             continue
@@ -117,7 +178,25 @@ async def recommend_movies(req: Solicitud):
 
     candidatos.sort(key=lambda m: m.rating, reverse=True) # Ordenado por rating de forma descendente 
     
-    recommend = candidatos[:req.max_results]
+    return [movie.to_model() for movie in candidatos[:req.max_results]]
+
+# Peticiones iguales que llegan mientras otra se calcula esperan ese mismo resultado.
+# La clave incluye la versión del catálogo: tras un POST /movies se calcula de nuevo.
+# El orden de preferred_genres no cambia el resultado, por eso se normaliza.
+@router.post("/movies/recommend")
+@coalesce("movies.recommend", key=lambda req: (
+    versioning.version("movies"), tuple(sorted(set(req.preferred_genres))), req.min_year, req.max_results
+))
+async def recommend_movies(req: Solicitud):
+    if req.max_results <= 0:
+        raise HTTPException(
+            status_code=400, detail="max_results debe ser mayor que 0"
+        )
+    
+    # Copia del catálogo (en el event loop) y el filtrado/orden en un thread,
+    # así el loop queda libre y las peticiones repetidas se pueden juntar
+    snapshot = list(movies_history.values())
+    recommend = await run_in_threadpool(rank_movies, snapshot, req)
     
     return{
         "msg" : "",
@@ -2,9 +2,10 @@
 # API que simula un carrito con productos en memoria.
 
 from typing import Optional
-from uuid import uuid4
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel, Field
+from core import changefeed, fieldsets, versioning
+from core.records import format_id, new_id, parse_id
 
 router = APIRouter(prefix="", tags=["Ejercicio5"])
 
@@ -43,30 +44,53 @@ class CartView(BaseModel):
 # =========================
 # MEMORIA
 # =========================
-product_history: dict[str, Product] = {
-    "11111111-1111-1111-1111-111111111111": Product(
+# Registro compacto (con __slots__, id como int); Product solo se arma al responder.
+# Es mutable porque el stock cambia con cada item del carrito.
+class ProductRecord:
+    __slots__ = ("id", "name", "price", "stock")
+
+    def __init__(self, id: int, name: str, price: float, stock: int):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.stock = stock
+
+    def to_model(self) -> Product:
+        return Product.model_construct(id=format_id(self.id), name=self.name, price=self.price, stock=self.stock)
+
+product_history: dict[int, ProductRecord] = {}
+
+# Productos precargados: se cargan en startup() (lifespan de la app), no al importar
+PRODUCT_FIXTURES = [
+    dict(
         id="11111111-1111-1111-1111-111111111111",
         name="Mouse Gamer",
         price=79.90,
         stock=10
     ),
-    "22222222-2222-2222-2222-222222222222": Product(
+    dict(
         id="22222222-2222-2222-2222-222222222222",
         name="Teclado Mecánico",
         price=199.00,
         stock=5
     ),
-}
+]
 
-# carts[cart_id] = { product_id: quantity }
-cart_history: dict[str, dict[str, int]] = {}
+# carts[cart_id] = { product_id (int): quantity }
+cart_history: dict[str, dict[int, int]] = {}
 
 
 # =========================
 # HELPERS (para no repetir)
 # =========================
+def startup():
+    for data in PRODUCT_FIXTURES:
+        product_id = parse_id(data["id"])
+        product_history.setdefault(product_id, ProductRecord(**{**data, "id": product_id}))
+    versioning.bump("products")
+
 def get_product_or_404(product_id: str):
-    product = product_history.get(product_id)
+    product = product_history.get(parse_id(product_id))
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -85,13 +109,15 @@ def build_cart(cart_id: str):
     total = 0.0
 
     for pid, qty in cart.items():
-        prod = get_product_or_404(pid)
+        prod = product_history.get(pid)
+        if prod is None:
+            raise HTTPException(status_code=404, detail="Product not found")
         subtotal = prod.price * qty
         total += subtotal
 
         items.append(
             CartItemView(
-                product_id=pid,
+                product_id=format_id(pid),
                 name=prod.name,
                 price_unit=prod.price,
                 quantity=qty,
@@ -113,16 +139,19 @@ def build_cart(cart_id: str):
 # 1) POST /products
 @router.post("/products")
 async def create_product(payload: ProductCreate):
-    product_id = str(uuid4())
+    product_id = new_id()
 
-    product = Product(
+    record = ProductRecord(
         id=product_id,
         name=payload.name,
         price=payload.price,
         stock=payload.stock
     )
 
-    product_history[product_id] = product
+    product_history[product_id] = record
+    versioning.bump("products")
+    product = record.to_model()
+    changefeed.publish("products", "product.created", product)
     return {"msg": "producto creado", "data": product}
 
 
@@ -130,9 +159,17 @@ async def create_product(payload: ProductCreate):
 # Query params: max_price (float|null), in_stock (bool|null)
 @router.get("/products")
 async def list_products(
+    response: Response,
     max_price: Optional[float] = Query(default=None, gt=0),
     in_stock: Optional[bool] = Query(default=None),
+    fields: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
 ):
+    selected = fieldsets.parse_fields(fields, Product)
+    not_modified = versioning.conditional_get(if_none_match, response, ("products",), max_price, in_stock, fields)
+    if not_modified:
+        return not_modified
+
     result = []
 
     for p in product_history.values():
@@ -142,9 +179,9 @@ async def list_products(
             continue
         if in_stock is False and p.stock > 0:
             continue
-        result.append(p)
+        result.append(p.to_model())
 
-    return {"msg": "", "data": result}
+    return {"msg": "", "data": fieldsets.pick_fields(result, selected)}
 
 
 # 2) POST /cart/{cart_id}/items
@@ -160,18 +197,34 @@ async def add_item(cart_id: str, payload: CartItemCreate):
     cart = get_cart_or_create(cart_id)
 
     # Acumular cantidad
-    cart[payload.product_id] = cart.get(payload.product_id, 0) + payload.quantity
+    cart[product.id] = cart.get(product.id, 0) + payload.quantity
 
-    # Reservar stock (descontar)
+    # Reservar stock (descontar, el registro es mutable)
     product.stock -= payload.quantity
-    product_history[product.id] = product
+    versioning.bump("products")
+    versioning.bump("carts")
 
-    return {"msg": "item agregado al carrito", "data": build_cart(cart_id)}
+    view = build_cart(cart_id)
+    changefeed.publish("products", "product.stock_changed", {"id": format_id(product.id), "stock": product.stock})
+    changefeed.publish(f"carts/{cart_id}", "cart.updated", view)
+    return {"msg": "item agregado al carrito", "data": view}
 
 
 # 3) GET /cart/{cart_id}
+# El carrito depende de sus items y de los productos (nombre/precio), por eso el ETag usa ambos
 @router.get("/cart/{cart_id}")
-async def get_cart(cart_id: str):
+async def get_cart(
+    cart_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    # Primero que exista: If-None-Match: * solo vale si hay una representación actual (RFC 9110 13.1.2)
+    if cart_id not in cart_history:
+        raise HTTPException(status_code=404, detail="Cart not found")
+    not_modified = versioning.conditional_get(if_none_match, response, ("carts", "products"), cart_id)
+    if not_modified:
+        return not_modified
+
     return {"msg": "", "data": build_cart(cart_id)}
 
 
@@ -182,21 +235,28 @@ async def delete_item(cart_id: str, product_id: str):
     if cart is None:
         raise HTTPException(status_code=404, detail="Cart not found")
 
-    qty = cart.get(product_id)
+    key = parse_id(product_id)
+    qty = cart.get(key)
     if qty is None:
         raise HTTPException(status_code=404, detail="Item not found in cart")
 
     # Devolver stock
     product = get_product_or_404(product_id)
     product.stock += qty
-    product_history[product_id] = product
 
     # Eliminar item
-    del cart[product_id]
+    del cart[key]
+    versioning.bump("products")
+    versioning.bump("carts")
+    changefeed.publish("products", "product.stock_changed", {"id": format_id(product.id), "stock": product.stock})
 
     # Si queda vacío, borrar carrito (opcional)
     if len(cart) == 0:
         del cart_history[cart_id]
-        return {"msg": "item eliminado, carrito vacío", "data": {"id": cart_id, "items": [], "total": 0}}
+        empty = {"id": cart_id, "items": [], "total": 0}
+        changefeed.publish(f"carts/{cart_id}", "cart.deleted", empty)
+        return {"msg": "item eliminado, carrito vacío", "data": empty}
 
-    return {"msg": "item eliminado del carrito", "data": build_cart(cart_id)}
+    view = build_cart(cart_id)
+    changefeed.publish(f"carts/{cart_id}", "cart.updated", view)
+    return {"msg": "item eliminado del carrito", "data": view}
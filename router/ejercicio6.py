@@ -6,7 +6,10 @@ import re
 from collections import Counter
 from typing import Optional, Literal
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
+from core.corpus import CorpusIndex
+from core.singleflight import coalesce
 
 router = APIRouter(
     prefix="",
@@ -43,6 +46,36 @@ class CensorRequest(BaseModel):
 class CensorResponse(BaseModel):
     censored_text: str
 
+# Modo corpus: los documentos sí se guardan (en memoria) para poder buscarlos luego
+class DocumentCreate(BaseModel):
+    text: str = Field(..., min_length=1)
+    language: Literal["es", "en"]
+    title: Optional[str] = None
+    corpus: str = Field(default="default", min_length=1, max_length=50)
+
+class DocumentHit(BaseModel):
+    id: int
+    title: Optional[str]
+    score: float
+    snippet: str
+
+class SearchResponse(BaseModel):
+    corpus: str
+    total: int
+    hits: list[DocumentHit]
+
+class TermStat(BaseModel):
+    word: str
+    count: int
+    documents: int
+
+class CorpusResponse(BaseModel):
+    corpus: str
+    documents: int
+    terms: int
+    postings_bytes: int
+    top_terms: list[TermStat]
+
 
 # =========================
 # HELPERS
@@ -77,6 +110,18 @@ def get_stopwords(language: str):
     return set()
 
 
+# corpus -> índice TF-IDF (se crea al agregar el primer documento)
+corpora: dict[str, CorpusIndex] = {}
+
+def get_corpus_or_404(corpus: str) -> CorpusIndex:
+    index = corpora.get(corpus)
+    if index is None:
+        raise HTTPException(status_code=404, detail="Corpus not found")
+    return index
+
+SNIPPET_CHARS = 160
+
+
 # =========================
 # ENDPOINTS
 # =========================
@@ -88,21 +133,17 @@ def get_stopwords(language: str):
 # - número de caracteres
 # - top 5 palabras más repetidas
 # Reto extra: ignore_stopwords=true (query param)
-@router.post("/text/analyze", response_model=TextAnalyzeResponse)
-async def analyze_text(
-    payload: TextAnalyzeRequest,
-    ignore_stopwords: bool = Query(default=False)
-):
-    words = tokenize(payload.text)
+def analyze(text: str, language: str, ignore_stopwords: bool) -> TextAnalyzeResponse:
+    words = tokenize(text)
     total_words = len(words)
-    total_chars = len(payload.text)
+    total_chars = len(text)
 
     # Conteo base (case-insensitive para que sea “de examen” y consistente)
     normalized = [w.lower() for w in words]
 
     # Aplicar stopwords solo para el TOP (más útil y más estándar)
     if ignore_stopwords:
-        sw = get_stopwords(payload.language)
+        sw = get_stopwords(language)
         normalized_for_top = [w for w in normalized if w not in sw]
     else:
         normalized_for_top = normalized
@@ -119,6 +160,15 @@ async def analyze_text(
         top_words=top_words
     )
 
+# Textos idénticos enviados a la vez se analizan una sola vez (el análisis va en un thread)
+@router.post("/text/analyze", response_model=TextAnalyzeResponse)
+@coalesce("text.analyze")
+async def analyze_text(
+    payload: TextAnalyzeRequest,
+    ignore_stopwords: bool = Query(default=False)
+):
+    return await run_in_threadpool(analyze, payload.text, payload.language, ignore_stopwords)
+
 
 # 2) GET /text/{word}/frequency
 # Path: word
@@ -168,3 +218,54 @@ async def censor_text(payload: CensorRequest):
     censored = re.sub(pattern, repl, payload.text, flags=re.IGNORECASE)
 
     return CensorResponse(censored_text=censored)
+
+
+# 4) POST /text/documents
+# Body: { "text": str, "language": "es|en", "title": str | null, "corpus": str }
+# Agrega el documento al índice del corpus (sin stopwords del idioma del documento)
+@router.post("/text/documents")
+async def add_document(payload: DocumentCreate):
+    index = corpora.get(payload.corpus)
+    if index is None:
+        index = corpora[payload.corpus] = CorpusIndex(tokenize)
+    document = index.add(payload.text, payload.language, get_stopwords(payload.language), payload.title)
+    return {
+        "msg": "documento agregado",
+        "data": {"id": document["id"], "corpus": payload.corpus, "terms": document["terms"]}
+    }
+
+
+# 5) GET /text/search?q=
+# Query: q (obligatorio), corpus (default "default"), limit
+# Documentos del corpus ordenados por TF-IDF
+@router.get("/text/search", response_model=SearchResponse)
+async def search_documents(
+    q: str = Query(..., min_length=1),
+    corpus: str = Query(default="default"),
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    total, hits = get_corpus_or_404(corpus).search(q, limit)
+    return SearchResponse(
+        corpus=corpus,
+        total=total,
+        hits=[
+            DocumentHit(id=doc["id"], title=doc["title"], score=round(score, 6),
+                        snippet=doc["text"][:SNIPPET_CHARS])
+            for doc, score in hits
+        ]
+    )
+
+
+# 6) GET /text/corpus/{corpus}
+# Tamaño del corpus y sus términos más frecuentes (sin volver a leer los textos)
+@router.get("/text/corpus/{corpus}", response_model=CorpusResponse)
+async def corpus_stats(
+    corpus: str,
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    index = get_corpus_or_404(corpus)
+    return CorpusResponse(
+        corpus=corpus,
+        **index.stats(),
+        top_terms=[TermStat(word=w, count=c, documents=df) for w, c, df in index.top_terms(limit)]
+    )
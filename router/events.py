@@ -0,0 +1,104 @@
+# Suscripción a cambios de los stores (en vez de hacer polling)
+# - GET /events?topics=tasks,carts/abc   -> Server-Sent Events
+# - WS  /ws/events?topics=products        -> WebSocket (un mensaje JSON por evento)
+# Ver core/changefeed.py para los tópicos y el manejo de clientes lentos.
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from core.changefeed import feed
+
+router = APIRouter(
+    prefix="",
+    tags=["Eventos"]
+)
+
+TOPICS = {"tasks", "conversions", "users", "movies", "products", "carts"}
+KEEPALIVE_SECONDS = 15
+
+
+def parse_topics(topics: str) -> list[str]:
+    parsed = [t.strip() for t in topics.split(",") if t.strip()]
+    invalid = [t for t in parsed if t.split("/", 1)[0] not in TOPICS]
+    if not parsed or invalid:
+        raise HTTPException(
+            status_code=400,
+            detail={"msg": "Tópicos inválidos", "invalid": invalid, "allowed": sorted(TOPICS)}
+        )
+    return parsed
+
+
+# 1) GET /events (SSE)
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    topics: str = Query(..., min_length=1)
+):
+    parsed = parse_topics(topics)
+
+    async def event_stream():
+        # La suscripción se abre dentro del generador: así el finally siempre la cierra
+        sub = feed.subscribe(parsed)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(sub.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    yield "event: dropped\ndata: {\"msg\": \"cliente demasiado lento\"}\n\n"
+                    return
+                yield f"data: {message}\n\n"
+        finally:
+            feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# 2) WS /ws/events
+@router.websocket("/ws/events")
+async def websocket_events(
+    websocket: WebSocket,
+    topics: str = Query(..., min_length=1)
+):
+    try:
+        parsed = parse_topics(topics)
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=str(exc.detail["msg"]))
+        return
+
+    await websocket.accept()
+    sub = feed.subscribe(parsed)
+
+    async def pump():
+        while True:
+            message = await sub.get()
+            if message is None:
+                # 1013 = "try again later": se le expulsó por no leer a tiempo
+                await websocket.close(code=1013, reason="cliente demasiado lento")
+                return
+            await websocket.send_text(message)
+
+    async def listen():
+        # Solo para enterarse de que el cliente se fue (los mensajes que mande se ignoran)
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(listen())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        feed.unsubscribe(sub)
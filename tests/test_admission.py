@@ -0,0 +1,134 @@
+# AdmissionMiddleware (core/admission.py): token buckets, X-Forwarded-For y límites de body
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from core import admission
+from core.admission import AdmissionMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", fake)
+    return fake
+
+
+def middleware(**kwargs) -> AdmissionMiddleware:
+    return AdmissionMiddleware(app=None, **kwargs)
+
+
+def test_bucket_spends_and_refills(clock):
+    mw = middleware(rate=10, burst=20)
+    assert mw.take("a", 15) == 0
+    # quedan 5 tokens: faltan 5 -> 0.5 s a 10 tokens/s
+    assert mw.take("a", 10) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert mw.take("a", 10) == 0
+    # nunca se acumula más que el burst
+    clock.now += 3600
+    assert mw.take("a", 20) == 0
+    assert mw.take("a", 1) > 0
+
+
+def test_buckets_are_per_client_and_bounded(clock):
+    mw = middleware(rate=1, burst=5, max_clients=2)
+    assert mw.take("a", 5) == 0
+    assert mw.take("a", 1) > 0
+    assert mw.take("b", 5) == 0  # otro cliente, bucket propio
+    mw.take("c", 1)
+    assert list(mw.buckets) == ["b", "c"]  # "a" era el inactivo hace más tiempo
+
+
+def test_route_costs():
+    mw = middleware()
+    assert mw.cost("POST", "/text/analyze") == 10
+    assert mw.cost("GET", "/text/analyze") == 1
+    assert mw.cost("GET", "/tasks") == 1
+    assert middleware(burst=4).cost("GET", "/tasks_all") == 4  # nunca más que el burst
+
+
+def forwarded_scope(value: str) -> tuple[dict, Headers]:
+    scope = {"client": ("10.0.0.1", 1234), "headers": [(b"x-forwarded-for", value.encode())]}
+    return scope, Headers(scope=scope)
+
+
+def test_client_id_ignores_forwarded_by_default():
+    scope, headers = forwarded_scope("1.1.1.1")
+    assert middleware().client_id(scope, headers) == "10.0.0.1"
+
+
+def test_client_id_takes_entry_added_by_trusted_proxies():
+    scope, headers = forwarded_scope("6.6.6.6, 2.2.2.2, 3.3.3.3")
+    # el cliente falsificó 6.6.6.6; el proxy más externo agregó 2.2.2.2
+    assert middleware(trusted_proxies=1).client_id(scope, headers) == "3.3.3.3"
+    assert middleware(trusted_proxies=2).client_id(scope, headers) == "2.2.2.2"
+    # menos entradas que proxies: no se confía en la cabecera
+    assert middleware(trusted_proxies=4).client_id(scope, headers) == "10.0.0.1"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    app.add_middleware(AdmissionMiddleware, rate=1, burst=3, max_body_bytes=10, trusted_proxies=1)
+    return TestClient(app)
+
+
+def test_body_limits(client):
+    assert client.post("/echo", content=b"x" * 10).json() == {"size": 10}
+    assert client.post("/echo", content=b"x" * 11).status_code == 413
+    assert client.post("/echo", headers={"content-length": "abc"}).status_code == 400
+
+
+def test_rate_limit_per_forwarded_client(client):
+    for _ in range(3):
+        assert client.post("/echo", headers={"x-forwarded-for": "9.9.9.9"}).status_code == 200
+    limited = client.post("/echo", headers={"x-forwarded-for": "9.9.9.9"})
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+    # falsificar la parte izquierda no da un bucket nuevo
+    spoofed = client.post("/echo", headers={"x-forwarded-for": "1.2.3.4, 9.9.9.9"})
+    assert spoofed.status_code == 429
+
+
+def test_limit_ceiling_any_spelling():
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(limit: int = 10):
+        return {"limit": limit}
+
+    app.add_middleware(AdmissionMiddleware, max_limit=1000)
+    client = TestClient(app)
+
+    assert client.get("/items?limit=1000").json() == {"limit": 1000}
+    for query in ["limit=5000", "limit=+5000", "limit=5000.0", "limit=5_000", "limit=%205000",
+                  "lim%69t=5000", "limit=10&limit=5000"]:
+        response = client.get(f"/items?{query}")
+        assert response.status_code == 400, query
+    # lo que no es entero lo rechaza la validación del handler
+    assert client.get("/items?limit=abc").status_code == 422
+
+
+def test_tasks_limit_bounded_without_admission():
+    from router import ejercicio1
+
+    app = FastAPI()
+    app.include_router(ejercicio1.router)
+    client = TestClient(app)
+    assert client.get("/tasks?limit=1000").status_code == 200
+    assert client.get("/tasks?limit=1000000").status_code == 422
@@ -0,0 +1,58 @@
+# Lista de contraseñas filtradas (core/breached.py)
+import hashlib
+
+import pytest
+
+from core import breached
+from core.breached import BreachedHashes
+
+
+def sha1(password: str) -> bytes:
+    return hashlib.sha1(password.encode()).digest()
+
+
+def build_file(tmp_path, lines: list[bytes], **kwargs) -> BreachedHashes:
+    path = tmp_path / "breached.bin"
+    breached.build(iter(lines), str(path), **kwargs)
+    return BreachedHashes(str(path))
+
+
+@pytest.mark.parametrize("width", [20, 8])
+def test_first_last_and_missing(tmp_path, width):
+    passwords = [f"clave{i}" for i in range(1000)]
+    index = build_file(tmp_path, [p.encode() + b"\n" for p in passwords], width=width, chunk_size=97)
+    digests = sorted(sha1(p)[:width] for p in passwords)
+    first = next(p for p in passwords if sha1(p)[:width] == digests[0])
+    last = next(p for p in passwords if sha1(p)[:width] == digests[-1])
+
+    assert len(index) == 1000
+    assert index.contains(first)
+    assert index.contains(last)
+    assert all(index.contains(p) for p in passwords)
+    # justo antes del primero y justo después del último
+    assert not index.contains_digest(b"\x00" * 20)
+    assert not index.contains_digest(b"\xff" * 20)
+    assert not index.contains("no-filtrada")
+
+
+def test_records_sorted_and_deduplicated(tmp_path):
+    lines = [b"hola123\n", b"hola123\n", sha1("hola123").hex().upper().encode() + b":42\n", b"\n", b"qwerty\r\n"]
+    index = build_file(tmp_path, lines)
+    assert len(index) == 2
+    raw = (tmp_path / "breached.bin").read_bytes()[breached.HEADER.size:]
+    assert [raw[i:i + 20] for i in range(0, len(raw), 20)] == sorted([sha1("hola123"), sha1("qwerty")])
+    assert index.contains("qwerty")
+
+
+def test_empty_file(tmp_path):
+    index = build_file(tmp_path, [])
+    assert len(index) == 0
+    assert not index.contains("cualquiera")
+    assert not index.contains_digest(b"\x00" * 20)
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "otra.bin"
+    path.write_bytes(b"no es un indice de nada")
+    with pytest.raises(ValueError):
+        BreachedHashes(str(path))
@@ -0,0 +1,90 @@
+# Change feed (core/changefeed.py) y WS /ws/events
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from core.changefeed import DROPPED, ChangeFeed
+
+
+def drain(sub) -> list:
+    messages = []
+    while not sub.queue.empty():
+        message = sub.queue.get_nowait()
+        messages.append(message if message is DROPPED else json.loads(message))
+    return messages
+
+
+def test_topic_filtering():
+    feed = ChangeFeed()
+    all_carts = feed.subscribe(["carts"])
+    one_cart = feed.subscribe(["carts/abc"])
+    tasks = feed.subscribe(["tasks"])
+
+    feed.publish("carts/abc", "cart.updated", {"id": "abc"})
+    feed.publish("carts/xyz", "cart.updated", {"id": "xyz"})
+    feed.publish("carts/abcd", "cart.updated", {"id": "abcd"})  # no es carts/abc
+    feed.publish("tasks", "task.created", {"id": 1})
+
+    assert [m["topic"] for m in drain(all_carts)] == ["carts/abc", "carts/xyz", "carts/abcd"]
+    assert [m["topic"] for m in drain(one_cart)] == ["carts/abc"]
+    assert [(m["event"], m["data"]) for m in drain(tasks)] == [("task.created", {"id": 1})]
+    assert feed.stats()["published"] == 4
+    assert feed.stats()["delivered"] == 5
+
+
+def test_event_ids_increase():
+    feed = ChangeFeed()
+    sub = feed.subscribe(["tasks"])
+    for i in range(3):
+        feed.publish("tasks", "task.created", {"i": i})
+    ids = [m["id"] for m in drain(sub)]
+    assert ids == sorted(ids) and len(set(ids)) == 3
+
+
+def test_slow_subscriber_is_dropped_and_unsubscribed():
+    feed = ChangeFeed()
+    slow = feed.subscribe(["tasks"], maxsize=2)
+    fast = feed.subscribe(["tasks"], maxsize=10)
+
+    for i in range(3):  # la tercera no cabe en la cola de `slow`
+        feed.publish("tasks", "task.created", {"i": i})
+
+    assert slow.dropped
+    assert drain(slow) == [DROPPED]  # se vacía la cola y queda solo la marca
+    assert len(drain(fast)) == 3  # los demás no se enteran
+    assert feed.stats()["subscribers"] == 1
+    assert feed.stats()["dropped_subscribers"] == 1
+
+    feed.publish("tasks", "task.created", {"i": 3})
+    assert drain(slow) == []  # ya no recibe nada
+
+
+def test_get_returns_none_after_drop():
+    async def scenario():
+        feed = ChangeFeed()
+        sub = feed.subscribe(["products"], maxsize=1)
+        feed.publish("products", "product.created", {})
+        feed.publish("products", "product.created", {})
+        return await sub.get()
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_unsubscribe_cleans_up_topics():
+    feed = ChangeFeed()
+    sub = feed.subscribe(["tasks", "carts/abc"])
+    feed.unsubscribe(sub)
+    assert feed.by_root == {}
+    assert feed.stats()["subscribers"] == 0
+
+
+def test_websocket_receives_task_created():
+    with TestClient(main.app, client=("10.1.0.1", 50000)) as client:
+        with client.websocket_connect("/ws/events?topics=tasks") as ws:
+            created = client.post("/tasks", json={"title": "Desde el feed", "priority": 2}).json()["data"]
+            message = ws.receive_json()
+    assert message["topic"] == "tasks"
+    assert message["event"] == "task.created"
+    assert message["data"]["id"] == created["id"]
@@ -0,0 +1,63 @@
+# GET condicionales (core/versioning.py), compresión (core/compression.py) y fields=
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+hosts = itertools.count(1)
+
+
+@pytest.fixture
+def client():
+    # Una IP distinta por test: cada uno con su propio token bucket en el control de admisión
+    with TestClient(main.app, client=(f"10.0.0.{next(hosts)}", 50000)) as client:
+        yield client
+
+
+def test_cart_if_none_match_star_needs_existing_cart(client):
+    assert client.get("/cart/no-existe", headers={"If-None-Match": "*"}).status_code == 404
+
+    client.post("/cart/etag-test/items", json={"product_id": "11111111-1111-1111-1111-111111111111", "quantity": 1})
+    assert client.get("/cart/etag-test", headers={"If-None-Match": "*"}).status_code == 304
+    client.delete("/cart/etag-test/items/11111111-1111-1111-1111-111111111111")
+
+
+def seed_tasks(client, n=10):
+    for i in range(n):
+        client.post("/tasks", json={"title": f"Tarea {i}", "description": "texto de relleno " * 10, "priority": 3})
+
+
+def test_compressed_200_and_304_share_validators(client):
+    seed_tasks(client)
+    ok = client.get("/tasks_all", headers={"Accept-Encoding": "gzip"})
+    assert ok.status_code == 200
+    assert ok.headers["content-encoding"] == "gzip"
+    assert ok.headers["etag"].startswith('W/"')
+    assert "Accept-Encoding" in ok.headers["vary"]
+
+    cached = client.get("/tasks_all", headers={"Accept-Encoding": "gzip", "If-None-Match": ok.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == ok.headers["etag"]
+    assert "Accept-Encoding" in cached.headers["vary"]
+
+
+def test_identity_keeps_strong_etag(client):
+    ok = client.get("/tasks_all", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in ok.headers
+    etag = ok.headers["etag"]
+    assert etag.startswith('"')
+
+    cached = client.get("/tasks_all", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    # el ETag débil del 200 comprimido también vale (comparación débil)
+    assert client.get("/tasks_all", headers={"Accept-Encoding": "identity", "If-None-Match": "W/" + etag}).status_code == 304
+
+
+def test_fields(client):
+    data = client.get("/tasks", params={"fields": "id,title"}).json()["data"]
+    assert data and all(set(task) == {"id", "title"} for task in data)
+    assert client.get("/tasks", params={"fields": "id,no_existe"}).status_code == 400
+    assert client.get("/tasks_all", params={"fields": "clave"}).status_code == 400
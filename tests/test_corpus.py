@@ -0,0 +1,52 @@
+# Postings varint del índice TF-IDF (core/corpus.py)
+import re
+
+import numpy as np
+
+from core.corpus import CorpusIndex, TermPostings, decode_varints, encode_varint
+
+
+def encode_all(values) -> bytearray:
+    buf = bytearray()
+    for value in values:
+        encode_varint(value, buf)
+    return buf
+
+
+def test_varint_sizes():
+    assert encode_all([0]) == b"\x00"
+    assert encode_all([127]) == b"\x7f"
+    assert encode_all([128]) == b"\x80\x01"
+    assert encode_all([300]) == b"\xac\x02"
+    assert len(encode_all([2**32])) == 5
+
+
+def test_varint_round_trip():
+    values = [0, 1, 127, 128, 255, 16383, 16384, 2**21 - 1, 2**21, 2**35 + 7, 5, 0]
+    assert decode_varints(encode_all(values)).tolist() == values
+    assert decode_varints(bytearray()).tolist() == []
+
+
+def test_postings_round_trip_multibyte_gaps_and_tfs():
+    docs = [0, 1, 200, 201, 70_000, 70_001, 3_000_000]
+    tfs = [1, 300, 2, 128, 1, 20_000, 7]
+    postings = TermPostings()
+    for doc, tf in zip(docs, tfs):
+        postings.append(doc, tf)
+
+    decoded_docs, decoded_tfs = postings.decode()
+    assert decoded_docs.tolist() == docs
+    assert decoded_tfs.tolist() == tfs
+    assert postings.df == len(docs)
+    assert postings.count == sum(tfs)
+
+
+def test_search_uses_decoded_postings():
+    index = CorpusIndex(lambda text: re.findall(r"\w+", text))
+    for i in range(300):  # salto de varios bytes hasta el último documento
+        index.add("relleno" if i < 299 else "gato gato perro", "es", set())
+    index.add("gato", "es", set())
+    total, hits = index.search("gato")
+    assert total == 2
+    assert [doc["id"] for doc, _ in hits] == [300, 299]
+    assert all(np.isfinite(score) for _, score in hits)
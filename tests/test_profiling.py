@@ -0,0 +1,62 @@
+# Perfilado opt-in (core/profiling.py) y GET /debug/profiles
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import profiling
+from core.profiling import WallClockSampler
+from router import debug
+
+
+def test_sampler_stop_does_not_wait_for_interval():
+    sampler = WallClockSampler(interval=10, loop_thread=threading.get_ident())
+    sampler.start()
+    t0 = time.perf_counter()
+    profile = sampler.stop()
+    assert time.perf_counter() - t0 < 0.5
+    assert profile["samples"] == 0
+
+
+def make_client(token: str) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/lenta")
+    async def lenta():
+        return {"ok": True}
+
+    app.include_router(debug.router)
+    profiling.install(app, token=token, threshold_ms=0, mode="cprofile")
+    return TestClient(app)
+
+
+def test_profiles_require_token():
+    profiling.ring.clear()
+    client = make_client("s3cret")
+    client.get("/lenta", headers={"X-Profile": "s3cret"})
+    client.get("/lenta", headers={"X-Profile": "otro"})  # token incorrecto: no se perfila
+
+    assert client.get("/debug/profiles").status_code == 403
+    assert client.get("/debug/profiles", headers={"X-Profile": "otro"}).status_code == 403
+    body = client.get("/debug/profiles", headers={"X-Profile": "s3cret"}).json()
+    assert [(e["route"], e["trigger"]) for e in body["data"]] == [("/lenta", "header")]
+
+
+def test_profiles_closed_without_token():
+    client = make_client("")
+    assert client.get("/debug/profiles", headers={"X-Profile": ""}).status_code == 403
+
+
+def test_token_is_per_app():
+    first = make_client("uno")
+    second = make_client("")  # una app creada después no cambia quién lee la primera
+    assert first.get("/debug/profiles", headers={"X-Profile": "uno"}).status_code == 200
+    assert second.get("/debug/profiles", headers={"X-Profile": "uno"}).status_code == 403
+
+
+def test_sampling_without_token_warns(caplog):
+    app = FastAPI()
+    with caplog.at_level("WARNING", logger="uvicorn.error"):
+        profiling.install(app, sample_rate=0.5)
+    assert "PROFILE_TOKEN" in caplog.text
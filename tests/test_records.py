@@ -0,0 +1,22 @@
+# Ids compactos (core/records.py)
+from core.records import format_id, new_id, parse_id
+
+CANONICAL = "60799464-972d-419b-857e-379664f33b91"
+
+
+def test_round_trip():
+    key = new_id()
+    assert parse_id(format_id(key)) == key
+    assert format_id(parse_id(CANONICAL)) == CANONICAL
+
+
+def test_only_canonical_form():
+    for value in [
+        CANONICAL.upper(),
+        CANONICAL.replace("-", ""),
+        "{" + CANONICAL + "}",
+        "urn:uuid:" + CANONICAL,
+        "no-es-un-id",
+        "",
+    ]:
+        assert parse_id(value) is None, value
@@ -0,0 +1,98 @@
+# LeaseQueue (core/scheduler.py) y POST /tasks/next
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import scheduler
+from core.scheduler import LeaseQueue
+from router import ejercicio1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler.time, "monotonic", fake)
+    return fake
+
+
+def claim_all(queue: LeaseQueue, **kwargs) -> list:
+    keys = []
+    while (lease := queue.claim(60, **kwargs)) is not None:
+        keys.append(lease.key)
+    return keys
+
+
+def test_claim_order_priority_then_creation(clock):
+    queue = LeaseQueue()
+    for key, priority in [("a", 2), ("b", 5), ("c", 2), ("d", 5), ("e", 1)]:
+        queue.push(key, priority)
+    assert claim_all(queue) == ["b", "d", "a", "c", "e"]
+    assert queue.stats() == {"pending": 0, "leased": 5}
+
+
+def test_min_priority_cutoff(clock):
+    queue = LeaseQueue()
+    for key, priority in [("low", 1), ("mid", 3), ("high", 4)]:
+        queue.push(key, priority)
+    assert claim_all(queue, min_priority=3) == ["high", "mid"]
+    # lo que no alcanzó sigue en la cola
+    assert queue.claim(60).key == "low"
+
+
+def test_expired_lease_returns_to_original_position(clock):
+    queue = LeaseQueue()
+    for key, priority in [("a", 3), ("b", 3), ("c", 3)]:
+        queue.push(key, priority)
+    first = queue.claim(10, worker="w1")
+    assert first.key == "a"
+
+    clock.now += 11
+    assert queue.stats() == {"pending": 3, "leased": 0}
+    # "a" vuelve delante de "b" y "c" (mismo orden de creación)
+    second = queue.claim(10, worker="w2")
+    assert second.key == "a"
+    assert second.lease_id != first.lease_id
+    assert claim_all(queue) == ["b", "c"]
+
+
+def test_complete_while_leased(clock):
+    queue = LeaseQueue()
+    queue.push("a", 3)
+    queue.push("b", 1)
+    assert queue.claim(10).key == "a"
+
+    queue.complete("a")
+    clock.now += 60  # el lease vencido de una tarea completada no la devuelve a la cola
+    assert queue.stats() == {"pending": 1, "leased": 0}
+    assert claim_all(queue) == ["b"]
+    assert len(queue) == 1
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ejercicio1.router)
+    ejercicio1.tasks_repertory.clear()
+    ejercicio1.reindex_tasks()
+    yield TestClient(app)
+    ejercicio1.tasks_repertory.clear()
+    ejercicio1.reindex_tasks()
+
+
+def test_next_task_empty_queue_is_204(client):
+    assert client.post("/tasks/next").status_code == 204
+
+    task = client.post("/tasks", json={"title": "Pruebas", "priority": 3}).json()["data"]
+    claimed = client.post("/tasks/next", json={"worker": "w1"})
+    assert claimed.status_code == 200
+    assert claimed.json()["data"]["id"] == task["id"]
+    # prestada: no hay otra pendiente
+    assert client.post("/tasks/next").status_code == 204
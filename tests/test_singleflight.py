@@ -0,0 +1,128 @@
+# Coalescing de peticiones idénticas (core/singleflight.py)
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from core.singleflight import SingleFlight, coalesce, get_group
+from router import ejercicio4
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    async def scenario():
+        group = SingleFlight("test.dedup")
+        gate = asyncio.Event()
+        executions = 0
+
+        async def work():
+            nonlocal executions
+            executions += 1
+            await gate.wait()
+            return {"valor": 42}
+
+        waiters = [asyncio.ensure_future(group.do("k", work)) for _ in range(20)]
+        await asyncio.sleep(0)  # todas entran antes de abrir la compuerta
+        assert group.stats()["inflight"] == 1
+        gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert executions == 1
+        assert all(r is results[0] for r in results)
+        assert group.stats() == {"calls": 20, "executions": 1, "deduplicated": 19, "errors": 0, "inflight": 0}
+
+        # terminado el cálculo, la misma clave vuelve a ejecutarse
+        gate.set()
+        await group.do("k", work)
+        assert executions == 2
+
+    run(scenario())
+
+
+def test_different_keys_do_not_coalesce():
+    async def scenario():
+        group = SingleFlight("test.keys")
+        gate = asyncio.Event()
+
+        async def work(value):
+            await gate.wait()
+            return value
+
+        waiters = [asyncio.ensure_future(group.do(k, lambda k=k: work(k))) for k in ("a", "b")]
+        await asyncio.sleep(0)
+        gate.set()
+        assert await asyncio.gather(*waiters) == ["a", "b"]
+        assert group.stats()["executions"] == 2
+
+    run(scenario())
+
+
+def test_exception_is_shared_and_inflight_cleared():
+    async def scenario():
+        group = SingleFlight("test.errors")
+        gate = asyncio.Event()
+
+        async def failing():
+            await gate.wait()
+            raise HTTPException(status_code=400, detail="max_results debe ser mayor que 0")
+
+        waiters = [asyncio.ensure_future(group.do("k", failing)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, HTTPException) and r.status_code == 400 for r in results)
+        assert group.stats()["errors"] == 1
+        assert group.stats()["inflight"] == 0
+
+    run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def scenario():
+        group = SingleFlight("test.cancel")
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(group.do("k", work))
+        second = asyncio.ensure_future(group.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()  # p. ej. el cliente se desconectó
+        gate.set()
+        assert await second == "ok"
+
+    run(scenario())
+
+
+def test_recommend_max_results_zero_is_400_for_every_waiter():
+    async def scenario():
+        req = ejercicio4.Solicitud(preferred_genres=["drama"], max_results=0)
+        results = await asyncio.gather(
+            *(ejercicio4.recommend_movies(req) for _ in range(5)), return_exceptions=True
+        )
+        assert all(isinstance(r, HTTPException) and r.status_code == 400 for r in results)
+        assert get_group("movies.recommend").stats()["inflight"] == 0
+
+    run(scenario())
+
+
+def test_coalesce_decorator_default_key():
+    calls = []
+
+    @coalesce("test.decorator")
+    async def handler(x: int, y: int = 0):
+        calls.append((x, y))
+        await asyncio.sleep(0.01)
+        return x + y
+
+    async def scenario():
+        return await asyncio.gather(handler(1, y=2), handler(1, y=2), handler(2))
+
+    assert run(scenario()) == [3, 3, 2]
+    assert calls == [(1, 2), (2, 0)]